@@ -0,0 +1,5 @@
+import sys
+
+from advent.cli import main
+
+sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Benchmarks of every day and part over inputs of increasing size.
+
+For every run, the wall time, the cost per input line and the peak memory
+usage (as traced by tracemalloc) are recorded. Results can be saved to JSON,
+and compared against a previously saved baseline to find regressions.
+"""
+import contextlib
+from dataclasses import asdict, dataclass
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Generator, Iterable, NamedTuple, Optional
+
+from advent.generators import write_input
+from advent.runner import PARTS, SOLUTIONS, default_input_file_path, load_part
+
+
+DEFAULT_SIZES = (1, 10, 100)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+
+# days whose puzzle input stays valid when its lines are repeated
+REPEATABLE_DAYS = (1, 2, 3, 7)
+# generated input sizes matching the checked in puzzle inputs, which get
+# multiplied by the benchmark size
+GENERATED_BASE_SIZES = {1: 1000, 2: 100, 3: 140, 4: 200, 5: 40, 6: 4, 7: 1000, 8: 750}
+
+InputFactory = Callable[[int, int, Path], Optional[Path]]
+
+
+@dataclass(slots=True)
+class BenchResult:
+    day: int
+    part: int
+    size: int
+    line_count: int
+    wall_time: float  # seconds
+    time_per_line: float  # seconds
+    peak_memory: int  # bytes
+    # description of the exception raised by a failed run, which has no
+    # line count, timings nor memory usage
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> tuple[int, int, int]:
+        return self.day, self.part, self.size
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+
+class Regression(NamedTuple):
+    day: int
+    part: int
+    size: int
+    metric: str
+    baseline: float
+    current: float
+
+    def describe(self) -> str:
+        if self.metric == "error":
+            return f"day {self.day} part {self.part} size {self.size}: failed"
+        change = (self.current / self.baseline - 1) * 100 if self.baseline else float("inf")
+        return (
+            f"day {self.day} part {self.part} size {self.size}: {self.metric} "
+            f"went from {self.baseline:.6g} to {self.current:.6g} (+{change:.0f}%)"
+        )
+
+
+def repeated_input(day: int, size: int, folder: Path) -> Optional[Path]:
+    """
+    Create an input of the given size for the given day, by repeating
+    the lines of the checked in puzzle input size times. Return None for
+    days whose input cannot be repeated, apart from size 1, for which the
+    puzzle input itself is used.
+    """
+    puzzle_input_file_path = default_input_file_path(day)
+    if size == 1:
+        return puzzle_input_file_path
+    if day not in REPEATABLE_DAYS:
+        return None
+    contents = puzzle_input_file_path.read_bytes()
+    if not contents.endswith(b"\n"):
+        contents += b"\n"
+    input_file_path = Path(folder, f"{day}_{size}.txt")
+    with open(input_file_path, "wb") as file:
+        for _ in range(size):
+            file.write(contents)
+    return input_file_path
+
+
+def generated_input(day: int, size: int, folder: Path) -> Path:
+    """
+    Generate an input for the given day, as large as size times
+    the checked in puzzle input.
+    """
+    input_file_path = Path(folder, f"{day}_{size}.txt")
+    with open(input_file_path, "w") as file:
+        write_input(day, GENERATED_BASE_SIZES[day] * size, seed=size, output=file)
+    return input_file_path
+
+
+def count_lines(file_path: str | Path) -> int:
+    """Count the lines of a file, including a last line without newline"""
+    line_count = 0
+    last_chunk = b"\n"
+    with open(file_path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            line_count += chunk.count(b"\n")
+            last_chunk = chunk
+    if not last_chunk.endswith(b"\n"):
+        line_count += 1
+    return line_count
+
+
+@contextlib.contextmanager
+def disabled_cache() -> Generator[None, None, None]:
+    """Turn off the parsed input cache, so that every run parses its input"""
+    previous_value = os.environ.get("ADVENT_NO_CACHE")
+    os.environ["ADVENT_NO_CACHE"] = "1"
+    try:
+        yield
+    finally:
+        if previous_value is None:
+            del os.environ["ADVENT_NO_CACHE"]
+        else:
+            os.environ["ADVENT_NO_CACHE"] = previous_value
+
+
+def bench_part(
+    day: int,
+    part: int,
+    size: int,
+    input_file_path: Path,
+    repeat: int = DEFAULT_REPEAT
+) -> BenchResult:
+    """
+    Benchmark the given part of the given day on the given input. The wall
+    time is the best of repeat runs, peak memory is measured in one extra
+    run, as tracing memory allocations slows everything down considerably.
+    """
+    function = load_part(day, part)
+    wall_time = float("inf")
+    with contextlib.redirect_stdout(None):
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            function(input_file_path)
+            wall_time = min(wall_time, time.perf_counter() - start_time)
+        tracemalloc.start()
+        try:
+            function(input_file_path)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    line_count = count_lines(input_file_path)
+    return BenchResult(
+        day=day,
+        part=part,
+        size=size,
+        line_count=line_count,
+        wall_time=wall_time,
+        time_per_line=wall_time / max(line_count, 1),
+        peak_memory=peak_memory
+    )
+
+
+def run_benchmarks(
+    days: Iterable[int] = tuple(SOLUTIONS),
+    parts: Iterable[int] = PARTS,
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    input_factory: InputFactory = generated_input,
+    inputs_folder: Optional[str | Path] = None,
+    use_cache: bool = False
+) -> Generator[BenchResult, None, None]:
+    """
+    Benchmark every given part of every given day, at every given input size.
+    Results are yielded as soon as each run finishes. Sizes the input factory
+    cannot produce for a day are skipped. Runs which fail (for example when
+    a solution cannot cope with large inputs) are yielded as failed results,
+    holding the error instead of timings.
+    """
+    with contextlib.ExitStack() as stack:
+        if inputs_folder is None:
+            inputs_folder = stack.enter_context(tempfile.TemporaryDirectory())
+        if not use_cache:
+            stack.enter_context(disabled_cache())
+        inputs_folder = Path(inputs_folder)
+        inputs_folder.mkdir(parents=True, exist_ok=True)
+        for day in days:
+            for size in sizes:
+                input_file_path = input_factory(day, size, inputs_folder)
+                if input_file_path is None:
+                    continue
+                for part in parts:
+                    try:
+                        result = bench_part(day, part, size, input_file_path, repeat)
+                    except Exception as error:
+                        result = BenchResult(
+                            day=day,
+                            part=part,
+                            size=size,
+                            line_count=0,
+                            wall_time=0.0,
+                            time_per_line=0.0,
+                            peak_memory=0,
+                            error=repr(error)
+                        )
+                    yield result
+
+
+def save_results(results: Iterable[BenchResult], file_path: str | Path) -> None:
+    with open(file_path, "w") as file:
+        json.dump([asdict(result) for result in results], file, indent=2)
+
+
+def load_results(file_path: str | Path) -> list[BenchResult]:
+    with open(file_path, "r") as file:
+        return [BenchResult(**result) for result in json.load(file)]
+
+
+def find_regressions(
+    results: Iterable[BenchResult],
+    baseline: Iterable[BenchResult],
+    threshold: float = DEFAULT_THRESHOLD
+) -> list[Regression]:
+    """
+    Compare results against a baseline, and return every wall time or peak
+    memory which grew by more than the threshold (0.25 meaning 25%), as well
+    as every failed run, with an "error" metric. Other results without
+    a matching successful baseline entry (same day, part and size) are ignored.
+    """
+    baseline_by_key = {result.key: result for result in baseline}
+    regressions: list[Regression] = []
+    for result in results:
+        if result.failed:
+            regressions.append(Regression(*result.key, "error", 0, 0))
+            continue
+        baseline_result = baseline_by_key.get(result.key)
+        if baseline_result is None or baseline_result.failed:
+            continue
+        for metric in ("wall_time", "peak_memory"):
+            baseline_value = getattr(baseline_result, metric)
+            current_value = getattr(result, metric)
+            if current_value > baseline_value * (1 + threshold):
+                regressions.append(
+                    Regression(*result.key, metric, baseline_value, current_value)
+                )
+    return regressions
+
+
+def format_result(result: BenchResult) -> str:
+    if result.failed:
+        return f"day {result.day} part {result.part} size {result.size:>5}: failed with {result.error}"
+    return (
+        f"day {result.day} part {result.part} size {result.size:>5}: "
+        f"{result.wall_time * 1_000:10.2f} ms, "
+        f"{result.time_per_line * 1_000_000:8.2f} us/line, "
+        f"{result.peak_memory / 1024:10.1f} KiB peak"
+    )
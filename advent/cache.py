@@ -0,0 +1,161 @@
+"""
+On-disk cache for parsed puzzle inputs.
+
+Parsing functions which take the input file path as their first argument can
+be decorated with disk_cache, after which their result is pickled to the cache
+folder. The cache key is made up of the name of the function, its parser
+version and a hash of the contents of the input file, so a changed input file
+or a bumped parser version never returns stale data.
+
+The cache folder defaults to ~/.cache/advent and can be changed using the
+ADVENT_CACHE_DIR environment variable. Setting ADVENT_NO_CACHE disables
+the cache entirely.
+"""
+import functools
+import hashlib
+import os
+from pathlib import Path
+import pickle
+from typing import Any, Callable, Optional
+
+from advent.common import open_atomically
+
+
+CACHE_FILE_SUFFIX = ".pickle"
+DEFAULT_CACHE_FOLDER = Path(Path.home(), ".cache", "advent")
+DEFAULT_CACHE_MAX_SIZE = 512 * 1024 * 1024  # bytes
+
+
+def get_cache_folder() -> Path:
+    """Return the folder which cached parsing results are stored in"""
+    return Path(os.environ.get("ADVENT_CACHE_DIR", DEFAULT_CACHE_FOLDER))
+
+
+def is_cache_enabled() -> bool:
+    return not os.environ.get("ADVENT_NO_CACHE")
+
+
+def hash_file(file_path: str | Path) -> str:
+    """Compute a hash of the contents of the file at the given file_path"""
+    with open(file_path, "rb") as file:
+        digest = hashlib.file_digest(file, lambda: hashlib.blake2b(digest_size=16))
+        return digest.hexdigest()
+
+
+def cache_file_name(name: str, version: int, key: str) -> str:
+    return f"{name}-v{version}-{key}{CACHE_FILE_SUFFIX}"
+
+
+def evict(cache_folder: str | Path, max_size: int) -> None:
+    """
+    Delete the least recently used cache entries from the given cache folder,
+    until the total size of the remaining entries is at most max_size bytes.
+    """
+    entries = []
+    for entry in Path(cache_folder).glob(f"*{CACHE_FILE_SUFFIX}"):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+    total_size = sum(size for _, size, _ in entries)
+    entries.sort()
+    for _, size, entry in entries:
+        if total_size <= max_size:
+            break
+        entry.unlink(missing_ok=True)
+        total_size -= size
+
+
+def clear_cache(
+    cache_folder: Optional[str | Path] = None,
+    name: Optional[str] = None
+) -> int:
+    """
+    Delete cache entries, either all of them or only the ones belonging
+    to the function with given name. Return the number of deleted entries.
+    """
+    if cache_folder is None:
+        cache_folder = get_cache_folder()
+    pattern = f"{name}-v*{CACHE_FILE_SUFFIX}" if name else f"*{CACHE_FILE_SUFFIX}"
+    deleted_count = 0
+    for entry in Path(cache_folder).glob(pattern):
+        entry.unlink(missing_ok=True)
+        deleted_count += 1
+    return deleted_count
+
+
+def _write_entry(cache_file_path: Path, value: Any) -> None:
+    """Pickle value into cache_file_path, replacing it atomically"""
+    with open_atomically(cache_file_path, "wb") as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def disk_cache(
+    version: int,
+    cache_folder: Optional[str | Path] = None,
+    max_size: int = DEFAULT_CACHE_MAX_SIZE
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator caching the result of a parsing function on disk. The decorated
+    function must take the path of the input file as its first argument, and
+    return something picklable. Bump version whenever the structure returned
+    by the function changes, so that older cache entries are not used anymore.
+
+    Inputs given as streams rather than file paths are always parsed, as
+    hashing them would mean reading them twice.
+
+    The decorated function gets a cache_clear() method, which deletes all of
+    its cache entries.
+
+    :param version: version of the parser
+    :param cache_folder: folder to store entries in, see get_cache_folder
+    :param max_size: maximum total size of the cache folder in bytes, least
+        recently used entries get evicted once it is exceeded
+    """
+    def decorator(function: Callable) -> Callable:
+        name = f"{function.__module__}.{function.__qualname__}"
+
+        def resolve_cache_folder() -> Path:
+            if cache_folder is None:
+                return get_cache_folder()
+            return Path(cache_folder)
+
+        @functools.wraps(function)
+        def wrapper(input_file_path: str | Path, *args, **kwargs):
+            if not is_cache_enabled() or not isinstance(input_file_path, (str, os.PathLike)):
+                return function(input_file_path, *args, **kwargs)
+            key = hash_file(input_file_path)
+            if args or kwargs:
+                arguments = repr((args, sorted(kwargs.items()))).encode()
+                key += hashlib.blake2b(arguments, digest_size=8).hexdigest()
+            folder = resolve_cache_folder()
+            cache_file_path = Path(folder, cache_file_name(name, version, key))
+            try:
+                with open(cache_file_path, "rb") as file:
+                    value = pickle.load(file)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                # corrupted or incompatible entry, parse again
+                cache_file_path.unlink(missing_ok=True)
+            else:
+                # bump modification time, which eviction uses as last access
+                os.utime(cache_file_path)
+                return value
+            value = function(input_file_path, *args, **kwargs)
+            _write_entry(cache_file_path, value)
+            # entries of older parser versions are never going to be used
+            for entry in folder.glob(f"{name}-v*{CACHE_FILE_SUFFIX}"):
+                if not entry.name.startswith(f"{name}-v{version}-"):
+                    entry.unlink(missing_ok=True)
+            evict(folder, max_size)
+            return value
+
+        def cache_clear() -> int:
+            return clear_cache(resolve_cache_folder(), name)
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
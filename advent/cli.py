@@ -0,0 +1,283 @@
+"""
+Command line interface, used through `python -m advent`.
+
+    python -m advent run --day 4 --part 1 --input path/to/input.txt
+    generate_input | python -m advent run --day 4 --part 1 --input -
+    python -m advent bench --day 4 --sizes 1 10 --output results.json
+    python -m advent generate --day 4 --size 1000000 --output cards.txt
+    python -m advent run --day 4 --metrics metrics.prom --metrics-format prometheus
+    python -m advent follow --part 2 --input growing_calibration.txt
+
+Results are written to stdout as soon as each part finishes, one tab
+separated line per part: day, part, input file path and the answer.
+"""
+import argparse
+import os
+import sys
+from typing import Optional
+
+from advent import metrics
+from advent.runner import PARTS, SOLUTIONS, default_input_file_path, run_part
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="advent",
+        description="Advent of Code 2023 solutions"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="solve a day")
+    run_parser.add_argument(
+        "--day",
+        type=int,
+        required=True,
+        choices=sorted(SOLUTIONS),
+    )
+    run_parser.add_argument(
+        "--part",
+        type=int,
+        action="append",
+        choices=PARTS,
+        help="part to solve, can be repeated, defaults to all parts"
+    )
+    run_parser.add_argument(
+        "--input",
+        action="append",
+        help="input file, or - for stdin, can be repeated, "
+             "defaults to the day's puzzle input"
+    )
+    run_parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="show what the solutions print along the way"
+    )
+    run_parser.add_argument(
+        "--metrics",
+        help="record the time spent in every phase of the solutions, "
+             "and write it to this file"
+    )
+    run_parser.add_argument(
+        "--metrics-format",
+        choices=("json", "prometheus"),
+        default="json",
+        help="format of the metrics file"
+    )
+    run_parser.set_defaults(handler=run_command)
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="benchmark days over inputs of increasing size"
+    )
+    bench_parser.add_argument(
+        "--day",
+        type=int,
+        action="append",
+        choices=sorted(SOLUTIONS),
+        help="day to benchmark, can be repeated, defaults to all days"
+    )
+    bench_parser.add_argument(
+        "--part",
+        type=int,
+        action="append",
+        choices=PARTS,
+        help="part to benchmark, can be repeated, defaults to all parts"
+    )
+    bench_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="input sizes, as multiples of the size of the puzzle input"
+    )
+    bench_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of timed runs, the fastest one is recorded"
+    )
+    bench_parser.add_argument("--output", help="JSON file to write results to")
+    bench_parser.add_argument(
+        "--baseline",
+        help="JSON file with earlier results to check for regressions"
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative growth counted as a regression, 0.25 meaning 25%%"
+    )
+    bench_parser.add_argument(
+        "--inputs-folder",
+        help="folder to keep generated inputs in, defaults to a temporary one"
+    )
+    bench_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="use the parsed input cache, instead of parsing on every run"
+    )
+    bench_parser.set_defaults(handler=bench_command)
+
+    generate_parser = subparsers.add_parser(
+        "generate",
+        help="generate a large puzzle input"
+    )
+    generate_parser.add_argument(
+        "--day",
+        type=int,
+        required=True,
+        choices=sorted(SOLUTIONS),
+    )
+    generate_parser.add_argument(
+        "--size",
+        type=int,
+        required=True,
+        help="number of lines, games, rows, cards, ranges per map, races, "
+             "hands or nodes, depending on the day"
+    )
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument(
+        "--output",
+        help="file to write the input to, defaults to stdout"
+    )
+    generate_parser.set_defaults(handler=generate_command)
+
+    follow_parser = subparsers.add_parser(
+        "follow",
+        help="keep the day 1 calibration total of a growing file up to date"
+    )
+    follow_parser.add_argument("--part", type=int, default=1, choices=PARTS)
+    follow_parser.add_argument(
+        "--input",
+        required=True,
+        help="calibration file, which lines get appended to"
+    )
+    follow_parser.add_argument(
+        "--state",
+        help="file keeping the offset and total between runs, defaults to "
+             "the input file path followed by .partN.state.json"
+    )
+    follow_parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="seconds between checks of the input file"
+    )
+    follow_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="update the total once and exit, instead of watching the file"
+    )
+    follow_parser.set_defaults(handler=follow_command)
+    return parser
+
+
+def run_command(arguments: argparse.Namespace) -> int:
+    if arguments.metrics:
+        metrics.enable()
+    parts = arguments.part or PARTS
+    input_names = arguments.input or [str(default_input_file_path(arguments.day))]
+    for input_name in input_names:
+        if input_name != "-":
+            for part in parts:
+                result = run_part(arguments.day, part, input_name, arguments.verbose)
+                print(f"{arguments.day}\t{part}\t{input_name}\t{result}", flush=True)
+        elif len(parts) == 1:
+            # a single part can consume stdin as it comes in
+            result = run_part(arguments.day, parts[0], sys.stdin.buffer, arguments.verbose)
+            print(f"{arguments.day}\t{parts[0]}\t-\t{result}", flush=True)
+        else:
+            # stdin can only be read once, so keep a copy for the other parts,
+            # imported here, to keep the startup of the run command fast
+            import shutil
+            import tempfile
+
+            with tempfile.TemporaryFile() as spooled_input:
+                shutil.copyfileobj(sys.stdin.buffer, spooled_input)
+                for part in parts:
+                    spooled_input.seek(0)
+                    result = run_part(arguments.day, part, spooled_input, arguments.verbose)
+                    print(f"{arguments.day}\t{part}\t-\t{result}", flush=True)
+    if arguments.metrics:
+        if arguments.metrics_format == "prometheus":
+            metrics.write_prometheus(arguments.metrics)
+        else:
+            metrics.write_json(arguments.metrics)
+    return 0
+
+
+def bench_command(arguments: argparse.Namespace) -> int:
+    # imported here, to keep the startup of the run command fast
+    from advent import bench
+
+    results: list[bench.BenchResult] = []
+    for result in bench.run_benchmarks(
+        days=arguments.day or sorted(SOLUTIONS),
+        parts=arguments.part or PARTS,
+        sizes=arguments.sizes,
+        repeat=arguments.repeat,
+        inputs_folder=arguments.inputs_folder,
+        use_cache=arguments.cache
+    ):
+        print(bench.format_result(result), flush=True)
+        results.append(result)
+    if arguments.output:
+        bench.save_results(results, arguments.output)
+    if arguments.baseline:
+        baseline = bench.load_results(arguments.baseline)
+        regressions = bench.find_regressions(results, baseline, arguments.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression.describe()}")
+        if regressions:
+            return 1
+    if any(result.failed for result in results):
+        return 1
+    return 0
+
+
+def generate_command(arguments: argparse.Namespace) -> int:
+    from advent.generators import write_input
+
+    if arguments.output is None:
+        try:
+            write_input(arguments.day, arguments.size, arguments.seed)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # reader went away (e.g. piped into head), which is fine, but
+            # keep the interpreter from complaining while flushing stdout
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    with open(arguments.output, "w") as file:
+        write_input(arguments.day, arguments.size, arguments.seed, file)
+    return 0
+
+
+def follow_command(arguments: argparse.Namespace) -> int:
+    from advent.solutions import day_01
+
+    state_file_path = arguments.state or f"{arguments.input}.part{arguments.part}.state.json"
+    if arguments.part == 1:
+        sum_function = day_01.sum_calibration_values
+    else:
+        sum_function = day_01.sum_spelled_calibration_values
+    updates = day_01.follow(
+        arguments.input,
+        state_file_path,
+        sum_function,
+        arguments.interval
+    )
+    try:
+        for state in updates:
+            print(f"1\t{arguments.part}\t{arguments.input}\t{state.total}", flush=True)
+            if arguments.once:
+                break
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = build_parser()
+    arguments = parser.parse_args(argv)
+    return arguments.handler(arguments)
+
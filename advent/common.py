@@ -1,53 +1,391 @@
+from array import array
+import bisect
+import contextlib
+import functools
+import mmap
+import operator
 import os
 from pathlib import Path
 import re
-from typing import Generator
+import stat
+import time
+from typing import IO, Any, BinaryIO, Callable, Generator, Iterable, NamedTuple, Optional
 
 
 current_dir = Path(os.path.realpath(__file__)).parent
 INPUTS_FOLDER = Path(current_dir, "inputs")
 TEST_INPUTS_FOLDER = Path(current_dir, "tests", "inputs")
 
+# puzzle input, either as a path of a file, or as an already opened binary
+# stream (such as sys.stdin.buffer, a pipe or a socket file)
+InputSource = str | Path | BinaryIO
 
-def yield_lines(file_path: str | Path) -> Generator[str, None, None]:
+
+def is_file_path(source: InputSource) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+@contextlib.contextmanager
+def open_binary(source: InputSource) -> Generator[BinaryIO, None, None]:
+    """
+    Context manager providing a binary stream for the given input source.
+    Files are opened (and closed afterwards), streams are passed through
+    as they are, and are left open.
+    """
+    if is_file_path(source):
+        with open(source, "rb") as reader:
+            yield reader
+    else:
+        yield source
+
+
+def read_bytes(source: InputSource) -> bytes:
+    """Read the whole input source at once and return it as bytes"""
+    with open_binary(source) as reader:
+        return reader.read()
+
+
+@contextlib.contextmanager
+def map_bytes(source: InputSource) -> Generator[bytes | mmap.mmap, None, None]:
+    """
+    Context manager giving access to the whole contents of the input source.
+    Files are memory mapped rather than read into memory, streams (and empty
+    files, which cannot be mapped) are read in whole.
+    """
+    if not is_file_path(source):
+        yield source.read()
+        return
+    with open(source, "rb") as reader:
+        if os.fstat(reader.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            yield mapped_file
+
+
+def yield_lines(file_path: InputSource) -> Generator[str, None, None]:
     """
     Generator yielding file at given file_path line by line.
 
-    :param file_path: path of file which to read
+    :param file_path: path of file which to read, or a binary stream
     """
+    if not is_file_path(file_path):
+        for line in file_path:
+            yield line.decode()
+        return
     with open(file_path, "r") as reader:
         for line in reader:
             yield line
 
 
-def read_file(file_path: str | Path) -> str:
+def yield_lines_mmap(
+    file_path: InputSource,
+    as_text: bool = False,
+    range_start: int = 0,
+    range_end: Optional[int] = None
+) -> Generator[memoryview | str, None, None]:
+    """
+    Generator yielding file at given file_path line by line, using a memory
+    map instead of a buffered text reader. Lines keep their trailing newline,
+    same as with yield_lines.
+
+    By default, every line is a zero-copy memoryview slice of the mapped file,
+    which is only valid until the generator is exhausted or closed - call
+    bytes() on it to keep it around for longer. With as_text, each line is
+    decoded to str instead, which is the drop-in replacement for yield_lines.
+
+    Streams cannot be memory mapped, they are read line by line instead, and
+    do not support byte ranges.
+
+    :param file_path: path of file which to read, or a binary stream
+    :param as_text: whether to decode lines to str instead of yielding views
+    :param range_start: byte offset to start reading at, must be a line start
+    :param range_end: byte offset to stop reading at, must be a line start
+        (or the end of the file), defaults to the end of the file
+    """
+    if not is_file_path(file_path):
+        if range_start != 0 or range_end is not None:
+            raise ValueError("Byte ranges are only supported for files")
+        for line in file_path:
+            yield line.decode() if as_text else memoryview(line)
+        return
+    with open(file_path, "rb") as reader:
+        file_size = os.fstat(reader.fileno()).st_size
+        if file_size == 0:
+            # empty files cannot be memory mapped
+            return
+        mapped_file = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+    if range_end is None or range_end > file_size:
+        range_end = file_size
+    view = memoryview(mapped_file)
+    try:
+        line_start = range_start
+        while line_start < range_end:
+            line_end = mapped_file.find(b"\n", line_start, range_end) + 1
+            if line_end == 0:
+                line_end = range_end
+            if as_text:
+                yield str(view[line_start:line_end], "utf-8")
+            else:
+                yield view[line_start:line_end]
+            line_start = line_end
+    finally:
+        view.release()
+        try:
+            mapped_file.close()
+        except BufferError:
+            # caller still holds on to some line views, the map gets closed
+            # once they are garbage collected
+            pass
+
+
+def split_into_line_ranges(
+    file_path: str | Path,
+    range_count: int
+) -> list[tuple[int, int]]:
+    """
+    Split the file at given file_path into at most range_count byte ranges
+    of roughly equal size, each starting at the beginning of a line and ending
+    just after a newline (or at the end of the file). Ranges are given as
+    (start, end) tuples, where end is exclusive - makes sense for slicing.
+    """
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return []
+    boundaries = [0]
+    with open(file_path, "rb") as reader:
+        for i in range(1, range_count):
+            reader.seek(max(file_size * i // range_count, boundaries[-1]))
+            reader.readline()
+            boundary = reader.tell()
+            if boundary >= file_size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+    boundaries.append(file_size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+class MapReduceResult(NamedTuple):
+    result: Any
+    line_count: int
+    elapsed_time: float  # seconds
+
+    @property
+    def lines_per_second(self) -> float:
+        if self.elapsed_time == 0:
+            return 0.0
+        return self.line_count / self.elapsed_time
+
+    def report(self) -> str:
+        """Describe the throughput of the run in a human readable way"""
+        return (
+            f"Processed {self.line_count} lines in "
+            f"{self.elapsed_time * 1_000:.2f} ms "
+            f"({self.lines_per_second:,.0f} lines/s)"
+        )
+
+
+def map_reduce_line_range(
+    file_path: InputSource,
+    range_start: int,
+    range_end: Optional[int],
+    line_function: Callable[[str], Any],
+    reducer: Callable[[Any, Any], Any],
+    initial: Any
+) -> tuple[Any, int]:
+    """
+    Apply line_function to every line of the given byte range of a file, and
+    fold the results with reducer. Return the folded result and the number of
+    lines processed.
+    """
+    result = initial
+    line_count = 0
+    for line in yield_lines_mmap(file_path, True, range_start, range_end):
+        result = reducer(result, line_function(line))
+        line_count += 1
+    return result, line_count
+
+
+def map_reduce_ranges(
+    file_path: InputSource,
+    range_function: Callable[[InputSource, int, Optional[int]], tuple[Any, int]],
+    reducer: Callable[[Any, Any], Any] = operator.add,
+    initial: Any = 0,
+    workers: Optional[int] = None
+) -> MapReduceResult:
+    """
+    Apply range_function to byte ranges of the file at given file_path, and
+    combine the results with reducer, starting from initial.
+
+    The file is split into byte ranges aligned to line boundaries, which get
+    processed in parallel by a pool of worker processes. range_function is
+    called with the file path, the start and the end of its range (None for
+    the end of the file), and returns its result together with the number
+    of lines it processed. It can read lines around its range as well, when
+    it needs their context, as long as it only processes the lines within.
+    Both range_function and reducer have to be picklable, reducer has to be
+    associative and initial has to be its identity element - the results of
+    the ranges are combined with reducer, in file order.
+
+    Streams cannot be split into byte ranges, so they are always processed
+    as a single range, in the current process.
+
+    :param file_path: path of file which to read, or a binary stream
+    :param range_function: function processing the lines of a byte range
+    :param reducer: function combining two results into one
+    :param initial: starting value for the reduction
+    :param workers: number of worker processes, defaults to the CPU count,
+        with 1 everything is done in the current process
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    start_time = time.perf_counter()
+    if workers == 1 or not is_file_path(file_path):
+        result, line_count = range_function(file_path, 0, None)
+    else:
+        # imported here, as it is slow to import and rarely needed
+        from concurrent.futures import ProcessPoolExecutor
+
+        # a few ranges per worker, so that slower ranges even out
+        line_ranges = split_into_line_ranges(file_path, workers * 4)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(range_function, file_path, range_start, range_end)
+                for range_start, range_end in line_ranges
+            ]
+            partial_results = [future.result() for future in futures]
+        result = functools.reduce(
+            reducer,
+            (partial_result for partial_result, _ in partial_results),
+            initial
+        )
+        line_count = sum(count for _, count in partial_results)
+    elapsed_time = time.perf_counter() - start_time
+    return MapReduceResult(result, line_count, elapsed_time)
+
+
+def map_reduce_lines(
+    file_path: InputSource,
+    line_function: Callable[[str], Any],
+    reducer: Callable[[Any, Any], Any] = operator.add,
+    initial: Any = 0,
+    workers: Optional[int] = None
+) -> MapReduceResult:
+    """
+    Apply line_function to every line of the file at given file_path, and
+    combine the results with reducer, starting from initial.
+
+    Lines are processed in parallel, by byte ranges, see map_reduce_ranges.
+    Therefore, both line_function and reducer have to be picklable (module
+    level functions or functools.partial objects work), reducer has to be
+    associative and initial has to be its identity element.
+
+    Streams are processed line by line in the current process, as the lines
+    come in.
+
+    :param file_path: path of file which to read, or a binary stream
+    :param line_function: function called with every line (as str)
+    :param reducer: function combining two results into one
+    :param initial: starting value for the reduction
+    :param workers: number of worker processes, defaults to the CPU count,
+        with 1 everything is done in the current process
+    """
+    range_function = functools.partial(
+        map_reduce_line_range,
+        line_function=line_function,
+        reducer=reducer,
+        initial=initial
+    )
+    return map_reduce_ranges(file_path, range_function, reducer, initial, workers)
+
+
+def replacement_permissions(file_path: Path) -> int:
+    """
+    Permission bits for a file replacing the one at given file_path: those
+    of the existing file, or those open() gives new files under the umask
+    """
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        # the umask can only be read by setting it
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def open_atomically(file_path: str | Path, mode: str = "w") -> Generator[IO, None, None]:
+    """
+    Context manager providing a file which replaces the file at given
+    file_path atomically once written, so that readers of the file never
+    see it half written. Nothing gets replaced when writing fails. The
+    file keeps the permissions of the file it replaces, or gets the usual
+    permissions of new files when there was none.
+
+    :param file_path: path of the file to replace
+    :param mode: mode to open the file with, "w" or "wb"
+    """
+    # imported here, as it is slow to import and rarely needed
+    import tempfile
+
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, mode) as file:
+            yield file
+            # mkstemp creates files readable by their owner only
+            os.fchmod(file.fileno(), replacement_permissions(file_path))
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def write_text_atomically(file_path: str | Path, text: str) -> None:
+    """
+    Write text to the file at given file_path, replacing it atomically, see
+    open_atomically
+    """
+    with open_atomically(file_path) as file:
+        file.write(text)
+
+
+def read_file(file_path: InputSource) -> str:
     """
     Read file all at once and return as string
 
-    :param file_path: path of file which to read
+    :param file_path: path of file which to read, or a binary stream
     :return: entire file contents as str
     """
+    if not is_file_path(file_path):
+        return file_path.read().decode()
     with open(file_path, "r") as file:
         contents = file.read()
         return contents
     
 
-def read_file_to_list_of_lines(file_path: str | Path) -> str:
+def read_file_to_list_of_lines(file_path: InputSource) -> str:
     """
     Read file all at once and return as a list of strings, where each element
     in the list corresponds to one line in the text file.
     """
+    if not is_file_path(file_path):
+        return list(yield_lines(file_path))
     with open(file_path, "r") as file:
         lines = file.readlines()
         return lines
     
 
-def read_file_to_list_of_stripped_lines(file_path: str | Path) -> str:
+def read_file_to_list_of_stripped_lines(file_path: InputSource) -> str:
     """
     Read file all at once and return as a list of strings, where each element
     in the list corresponds to one line in the text file. Each line is stripped
     of trailing whitespace.
     """
+    if not is_file_path(file_path):
+        return [line.rstrip() for line in yield_lines(file_path)]
     with open(file_path, "r") as file:
         lines = file.readlines()
         stripped_lines = [line.rstrip() for line in lines]
@@ -77,12 +415,17 @@ def find_number_beginning(input: str, end_index: int) -> int:
 
 
 
+NUMBER_PATTERN = re.compile(r'-?\d+\.?\d*')
+DIGITS_PATTERN = re.compile(r'\d+')
+NON_DIGIT_PATTERN = re.compile(r'\D+')
+INTEGER_BYTES_PATTERN = re.compile(rb'-?\d+')
+
+
 def extract_numbers(string: str) -> list[int | float]:
     """
     Extract all the numbers in a string, return as list of ints and floats
     """
-    pattern = r'-?\d+\.?\d*'
-    numbers = re.findall(pattern, string)
+    numbers = NUMBER_PATTERN.findall(string)
     numbers = [float(num) if '.' in num else int(num) for num in numbers]
     return numbers
 
@@ -91,7 +434,188 @@ def extract_to_single_number(string: str) -> int:
     """
     Extract all the numbers in a string into one single number concatenated.
     """
-    pattern = r'\d+'
-    numbers = re.findall(pattern, string)
-    combined_number = int(''.join(numbers))
-    return combined_number
\ No newline at end of file
+    if DIGITS_PATTERN.search(string) is None:
+        raise ValueError(f"There are no numbers in {string!r}")
+    combined_number = int(NON_DIGIT_PATTERN.sub("", string))
+    return combined_number
+
+
+class NumberTokens(NamedTuple):
+    """
+    All the integers found in a buffer, as parallel packed arrays of their
+    values, and the (zero based) line and column each of them starts at.
+    """
+    values: array
+    lines: array
+    columns: array
+
+    def line_range(self, first_line: int, last_line: int) -> slice:
+        """
+        Return the slice of tokens which lie on lines first_line up to and
+        including last_line.
+        """
+        start = bisect.bisect_left(self.lines, first_line)
+        end = bisect.bisect_right(self.lines, last_line, start)
+        return slice(start, end)
+
+    def split_by_line(self) -> Generator[tuple[int, array], None, None]:
+        """
+        Yield the line number and values of every line containing numbers.
+        """
+        start = 0
+        token_count = len(self.lines)
+        while start < token_count:
+            line = self.lines[start]
+            end = bisect.bisect_right(self.lines, line, start)
+            yield line, self.values[start:end]
+            start = end
+
+
+def tokenize_numbers(buffer: bytes | mmap.mmap) -> NumberTokens:
+    """
+    Find all the integers in a buffer in one single scan over it. Returns the
+    values together with their line and column numbers, in packed arrays
+    instead of lists of Python objects.
+    """
+    values = array("q")
+    lines = array("q")
+    columns = array("q")
+    line = 0
+    line_start = 0
+    next_newline = buffer.find(b"\n")
+    for match in INTEGER_BYTES_PATTERN.finditer(buffer):
+        number_start = match.start()
+        while 0 <= next_newline < number_start:
+            line += 1
+            line_start = next_newline + 1
+            next_newline = buffer.find(b"\n", line_start)
+        values.append(int(match[0]))
+        lines.append(line)
+        columns.append(number_start - line_start)
+    return NumberTokens(values, lines, columns)
+
+
+def tokenize_file(file_path: InputSource) -> NumberTokens:
+    """
+    Find all the integers in the file at given file_path, see tokenize_numbers.
+    The file is memory mapped rather than read into memory, streams are read
+    in whole.
+    """
+    with map_bytes(file_path) as buffer:
+        return tokenize_numbers(buffer)
+
+
+def byte_table(predicate: Callable[[int], bool]) -> bytes:
+    """
+    Build a translation table for bytes.translate, mapping every byte for
+    which predicate holds to 1 and every other byte to 0.
+    """
+    return bytes(1 if predicate(byte) else 0 for byte in range(256))
+
+
+DIGIT_TABLE = byte_table(lambda byte: ord("0") <= byte <= ord("9"))
+SYMBOL_TABLE = byte_table(
+    lambda byte: not ord("0") <= byte <= ord("9") and byte not in b". \r\n"
+)
+
+
+class Grid:
+    """
+    A 2D grid of characters, stored row by row in a single flat bytearray.
+
+    The grid is surrounded by a border of padding cells, one on each side of
+    every row, and a padding row above and below. Thanks to that, every cell
+    of the grid has all 8 neighbours, which are found at fixed offsets from
+    its flat index, so there is no need for bounds checks. Rows shorter than
+    the longest one are padded at the end.
+    """
+    __slots__ = ("width", "height", "stride", "cells", "neighbour_offsets")
+
+    def __init__(self, rows: Iterable[str | bytes], padding: bytes = b"."):
+        encoded_rows = [
+            row.encode() if isinstance(row, str) else bytes(row) for row in rows
+        ]
+        self.height = len(encoded_rows)
+        self.width = max((len(row) for row in encoded_rows), default=0)
+        self.stride = self.width + 2
+        padding_row = padding * self.stride
+        cells = bytearray(padding_row)
+        for row in encoded_rows:
+            cells += padding + row.ljust(self.width, padding) + padding
+        cells += padding_row
+        self.cells = cells
+        stride = self.stride
+        self.neighbour_offsets = (
+            -stride - 1, -stride, -stride + 1,
+            -1, 1,
+            stride - 1, stride, stride + 1
+        )
+
+    @classmethod
+    def from_file(cls, file_path: InputSource, padding: bytes = b".") -> "Grid":
+        rows = read_bytes(file_path).splitlines()
+        return cls(rows, padding)
+
+    def index(self, row: int, column: int) -> int:
+        """Return the flat index of the cell at the given row and column"""
+        return (row + 1) * self.stride + column + 1
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Return the row and column of the cell at the given flat index"""
+        row, column = divmod(index, self.stride)
+        return row - 1, column - 1
+
+    def __getitem__(self, position: tuple[int, int]) -> str:
+        return chr(self.cells[self.index(*position)])
+
+    def row(self, row: int) -> bytes:
+        start = self.index(row, 0)
+        return bytes(self.cells[start:start + self.width])
+
+    def neighbours(self, index: int) -> list[int]:
+        """Return the flat indices of the 8 neighbours of the given cell"""
+        return [index + offset for offset in self.neighbour_offsets]
+
+    def mask(self, table: bytes) -> bytes:
+        """
+        Classify every cell (padding included) at once, using a translation
+        table built with byte_table. The result has 1 for every cell the
+        table maps to 1 and 0 elsewhere, at the same flat indices as cells.
+        """
+        return bytes(self.cells).translate(table)
+
+    def digit_mask(self) -> bytes:
+        return self.mask(DIGIT_TABLE)
+
+    def symbol_mask(self) -> bytes:
+        """Mask of cells which are neither digits nor dots"""
+        return self.mask(SYMBOL_TABLE)
+
+    def dilate(self, mask: bytes) -> bytes:
+        """
+        Grow a mask (as returned by mask) by one cell in every direction, so
+        that the result has 1 for every cell which has a 1 in the mask itself
+        or in any of its 8 neighbours.
+
+        The mask is turned into a single big integer, a byte per cell, and
+        shifted by whole bytes: one cell to the left and right, then one
+        row up and down. Cells only ever hold 0 or 1, so or-ing never carries
+        into the next cell, and the padding keeps rows from bleeding into
+        each other.
+        """
+        size = len(mask)
+        cells = int.from_bytes(mask, "little")
+        horizontal = cells | cells << 8 | cells >> 8
+        row_bits = 8 * self.stride
+        dilated = horizontal | horizontal << row_bits | horizontal >> row_bits
+        return (dilated & ((1 << 8 * size) - 1)).to_bytes(size, "little")
+
+    def find_all(self, character: str) -> list[int]:
+        """Return the flat indices of all cells containing given character"""
+        target = character.encode()
+        indices = []
+        index = self.cells.find(target)
+        while index != -1:
+            indices.append(index)
+            index = self.cells.find(target, index + 1)
+        return indices
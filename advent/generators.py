@@ -0,0 +1,224 @@
+"""
+Deterministic generators of large, valid puzzle inputs for every day.
+
+Every generator takes the size of the input (number of lines, games, rows,
+cards, ranges per map, races, hands or nodes - depending on the day) and a
+seeded random.Random instance, and lazily yields the lines of the input,
+so that inputs of any size can be streamed to disk without ever being
+held in memory.
+"""
+import random
+import string
+import sys
+from typing import Callable, Iterator, Optional, TextIO
+
+
+InputGenerator = Callable[[int, random.Random], Iterator[str]]
+
+DIGIT_WORDS = ("one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+COLORS = ("red", "green", "blue")
+SCHEMATIC_SYMBOLS = "*#+$/@%=&-"
+CARD_LABELS = "23456789TJQKA"
+ALMANAC_CATEGORIES = (
+    "seed", "soil", "fertilizer", "water", "light",
+    "temperature", "humidity", "location"
+)
+# node names of day 8 are made up of these letters, so that the only nodes
+# ending with A and Z are the start and end nodes
+NODE_LETTERS = string.ascii_uppercase[1:-1]
+# part two of day 6 joins the digits of all races into a single race, which
+# is solved with floats: past this many races, its numbers get too long for
+# the floats to be exact (and eventually to fit in a float at all)
+MAX_RACES = 5
+
+
+def generate_calibration_lines(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 1: lines of letters, digits and spelled out digits"""
+    for _ in range(size):
+        segments = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.3:
+                segments.append(str(rng.randint(1, 9)))
+            elif kind < 0.6:
+                segments.append(rng.choice(DIGIT_WORDS))
+            else:
+                segments.append(
+                    "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 6)))
+                )
+        rng.shuffle(segments)
+        yield "".join(segments) + "\n"
+
+
+def generate_game_records(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 2: game records with one to six hands of cubes each"""
+    for game_id in range(1, size + 1):
+        hands = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(COLORS, rng.randint(1, len(COLORS)))
+            hands.append(
+                ", ".join(f"{rng.randint(1, 20)} {color}" for color in colors)
+            )
+        yield f"Game {game_id}: {'; '.join(hands)}\n"
+
+
+def generate_schematic(
+    size: int,
+    rng: random.Random,
+    width: int = 140
+) -> Iterator[str]:
+    """Day 3: engine schematic rows of numbers, symbols and dots"""
+    for _ in range(size):
+        row: list[str] = []
+        row_length = 0
+        while row_length < width:
+            kind = rng.random()
+            if kind < 0.1 and row_length + 3 < width:
+                number = str(rng.randint(1, 999))
+                row.append(number + ".")
+                row_length += len(number) + 1
+            elif kind < 0.15:
+                row.append(rng.choice(SCHEMATIC_SYMBOLS))
+                row_length += 1
+            else:
+                row.append(".")
+                row_length += 1
+        yield "".join(row)[:width] + "\n"
+
+
+def generate_scratchcards(
+    size: int,
+    rng: random.Random,
+    winning_count: int = 10,
+    held_count: int = 25
+) -> Iterator[str]:
+    """
+    Day 4: scratchcards, never winning copies of cards past the last one.
+    Most cards match few numbers, so that the total number of cards won
+    stays within a small multiple of the number of cards.
+    """
+    for card_id in range(1, size + 1):
+        numbers = rng.sample(range(1, 100), winning_count + held_count)
+        winning_numbers = numbers[:winning_count]
+        match_count = 0 if rng.random() < 0.6 else rng.randint(1, 3)
+        match_count = min(match_count, size - card_id)
+        held_numbers = winning_numbers[:match_count] + numbers[winning_count + match_count:]
+        rng.shuffle(held_numbers)
+        winning = " ".join(f"{number:>2}" for number in winning_numbers)
+        held = " ".join(f"{number:>2}" for number in held_numbers)
+        yield f"Card {card_id:>3}: {winning} | {held}\n"
+
+
+def generate_almanac(
+    size: int,
+    rng: random.Random,
+    seed_range_count: int = 10
+) -> Iterator[str]:
+    """Day 5: seeds, followed by the category maps with size ranges each"""
+    space = 1 << 32
+    seeds = []
+    for _ in range(seed_range_count):
+        start = rng.randrange(space // 2)
+        seeds.extend((start, rng.randint(1, space // (4 * seed_range_count))))
+    yield f"seeds: {' '.join(map(str, seeds))}\n"
+    segment_length = space // size
+    for source, destination in zip(ALMANAC_CATEGORIES, ALMANAC_CATEGORIES[1:]):
+        yield "\n"
+        yield f"{source}-to-{destination} map:\n"
+        # every range gets its own segment of the source space, so that
+        # source ranges never overlap
+        for segment in range(size):
+            length = rng.randint(1, segment_length)
+            source_start = segment * segment_length + rng.randint(0, segment_length - length)
+            destination_start = rng.randrange(space - length)
+            yield f"{destination_start} {source_start} {length}\n"
+
+
+def generate_races(size: int, rng: random.Random) -> Iterator[str]:
+    """
+    Day 6: races whose distance records can always be beaten, at most
+    MAX_RACES of them whatever the size
+    """
+    times = [rng.randint(7, 100) for _ in range(min(size, MAX_RACES))]
+    # the best possible distance of a race lasting t is (t / 2) ** 2
+    distances = [rng.randint(time, time * time // 4 - 1) for time in times]
+    yield "Time:     " + " ".join(f"{time:>5}" for time in times) + "\n"
+    yield "Distance: " + " ".join(f"{distance:>5}" for distance in distances) + "\n"
+
+
+def generate_hands(size: int, rng: random.Random) -> Iterator[str]:
+    """Day 7: camel card hands and their bids"""
+    for _ in range(size):
+        hand = "".join(rng.choices(CARD_LABELS, k=5))
+        yield f"{hand} {rng.randint(1, 1000)}\n"
+
+
+def node_name(index: int, width: int) -> str:
+    letters = []
+    for _ in range(width):
+        index, remainder = divmod(index, len(NODE_LETTERS))
+        letters.append(NODE_LETTERS[remainder])
+    return "".join(reversed(letters))
+
+
+def generate_node_map(
+    size: int,
+    rng: random.Random,
+    direction_count: int = 293
+) -> Iterator[str]:
+    """
+    Day 8: directions and a node map of size nodes. Nodes form a chain from
+    AAA to ZZZ, where both directions only ever lead further along the chain,
+    so that ZZZ is always reached.
+    """
+    yield "".join(rng.choices("LR", k=direction_count)) + "\n"
+    yield "\n"
+    width = 3
+    while len(NODE_LETTERS) ** width < size:
+        width += 1
+    names = ["AAA"] + [node_name(i, width) for i in range(size - 2)] + ["ZZZ"]
+    for index, name in enumerate(names[:-1]):
+        left = names[index + 1]
+        right = names[min(index + rng.randint(1, 3), len(names) - 1)]
+        if rng.random() < 0.5:
+            left, right = right, left
+        yield f"{name} = ({left}, {right})\n"
+    yield "ZZZ = (ZZZ, ZZZ)\n"
+
+
+GENERATORS: dict[int, InputGenerator] = {
+    1: generate_calibration_lines,
+    2: generate_game_records,
+    3: generate_schematic,
+    4: generate_scratchcards,
+    5: generate_almanac,
+    6: generate_races,
+    7: generate_hands,
+    8: generate_node_map,
+}
+
+
+def generate_lines(day: int, size: int, seed: int = 0) -> Iterator[str]:
+    """Lazily yield the lines of a generated input for the given day"""
+    try:
+        generator = GENERATORS[day]
+    except KeyError:
+        raise ValueError(f"There is no input generator for day {day}") from None
+    if size < 1 or (day == 8 and size < 2):
+        raise ValueError(f"Input size {size} is too small for day {day}")
+    return generator(size, random.Random(seed))
+
+
+def write_input(
+    day: int,
+    size: int,
+    seed: int = 0,
+    output: Optional[TextIO] = None
+) -> None:
+    """
+    Write a generated input for the given day to output (stdout by default),
+    line by line.
+    """
+    if output is None:
+        output = sys.stdout
+    output.writelines(generate_lines(day, size, seed))
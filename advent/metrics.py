@@ -0,0 +1,196 @@
+"""
+Phase level timing of solutions.
+
+Code is split into named phases (parsing, solving, printing the answer...)
+with the phase context manager or the timed decorator. For every phase, the
+number of times it ran, its total wall time and CPU time and the number of
+items it processed (lines, games, hands...) are recorded.
+
+Recording is off by default, in which case phases cost a single function call
+and a flag check. It gets turned on with enable(), or by setting the
+ADVENT_METRICS environment variable. Recorded metrics can be inspected with
+get_metrics, or exported as JSON or in the Prometheus text exposition format.
+
+    with phase("day_07.parse") as current_phase:
+        hands = parse(input_file_path)
+        current_phase.add_items(len(hands))
+"""
+from dataclasses import asdict, dataclass
+import functools
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Optional
+
+from advent.common import write_text_atomically
+
+
+PROMETHEUS_PREFIX = "advent_phase"
+
+_enabled = bool(os.environ.get("ADVENT_METRICS"))
+
+
+@dataclass(slots=True)
+class PhaseMetrics:
+    name: str
+    calls: int = 0
+    wall_time_ns: int = 0
+    cpu_time_ns: int = 0
+    items: int = 0
+
+    @property
+    def wall_time(self) -> float:
+        return self.wall_time_ns / 1e9
+
+    @property
+    def cpu_time(self) -> float:
+        return self.cpu_time_ns / 1e9
+
+
+_metrics: dict[str, PhaseMetrics] = {}
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Forget every recorded metric"""
+    _metrics.clear()
+
+
+def get_metrics() -> dict[str, PhaseMetrics]:
+    """Return the metrics recorded so far, by phase name, in order of first use"""
+    return dict(_metrics)
+
+
+class _Phase:
+    __slots__ = ("metrics", "items", "wall_start", "cpu_start")
+
+    def __init__(self, name: str) -> None:
+        metrics = _metrics.get(name)
+        if metrics is None:
+            metrics = _metrics[name] = PhaseMetrics(name)
+        self.metrics = metrics
+        self.items = 0
+
+    def add_items(self, count: int) -> None:
+        self.items += count
+
+    def __enter__(self) -> "_Phase":
+        self.cpu_start = time.process_time_ns()
+        self.wall_start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        wall_end = time.perf_counter_ns()
+        cpu_end = time.process_time_ns()
+        metrics = self.metrics
+        metrics.calls += 1
+        metrics.wall_time_ns += wall_end - self.wall_start
+        metrics.cpu_time_ns += cpu_end - self.cpu_start
+        metrics.items += self.items
+
+
+class _DisabledPhase:
+    """Stands in for a phase while recording is off, doing nothing at all"""
+    __slots__ = ()
+
+    def add_items(self, count: int) -> None:
+        pass
+
+    def __enter__(self) -> "_DisabledPhase":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_DISABLED_PHASE = _DisabledPhase()
+
+
+def phase(name: str) -> _Phase | _DisabledPhase:
+    """
+    Context manager timing the code it wraps as the phase with given name.
+    Items processed by the phase can be counted using add_items on the object
+    returned by entering it. Phases can be nested, and a phase which runs
+    several times accumulates its metrics.
+    """
+    if not _enabled:
+        return _DISABLED_PHASE
+    return _Phase(name)
+
+
+def timed(
+    name: Optional[str] = None,
+    items: Optional[Callable[[Any], int]] = None
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator timing every call of the decorated function as a phase.
+
+    :param name: name of the phase, defaults to module.qualname of the function
+    :param items: function computing the number of processed items from
+        the return value of the decorated function
+    """
+    def decorator(function: Callable) -> Callable:
+        phase_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Phase(phase_name) as current_phase:
+                result = function(*args, **kwargs)
+                if items is not None:
+                    current_phase.add_items(items(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def to_json() -> str:
+    return json.dumps([asdict(metrics) for metrics in _metrics.values()], indent=2)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def to_prometheus() -> str:
+    """Format the recorded metrics in the Prometheus text exposition format"""
+    families = (
+        ("calls_total", "Number of times the phase ran", lambda m: m.calls),
+        ("wall_seconds_total", "Wall time spent in the phase", lambda m: m.wall_time),
+        ("cpu_seconds_total", "CPU time spent in the phase", lambda m: m.cpu_time),
+        ("items_total", "Number of items processed by the phase", lambda m: m.items),
+    )
+    lines = []
+    for suffix, description, get_value in families:
+        metric_name = f"{PROMETHEUS_PREFIX}_{suffix}"
+        lines.append(f"# HELP {metric_name} {description}")
+        lines.append(f"# TYPE {metric_name} counter")
+        for metrics in _metrics.values():
+            label = _escape_label_value(metrics.name)
+            lines.append(f"{metric_name}{{phase=\"{label}\"}} {get_value(metrics)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_json(file_path: str | Path) -> None:
+    write_text_atomically(file_path, to_json())
+
+
+def write_prometheus(file_path: str | Path) -> None:
+    write_text_atomically(file_path, to_prometheus())
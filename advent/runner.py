@@ -0,0 +1,79 @@
+"""
+Registry of the solutions for every day. Solution modules are only imported
+once one of their parts is actually run, so that running a single day does
+not pay for importing all the others.
+"""
+import contextlib
+import importlib
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, NamedTuple, Optional
+
+from advent.metrics import phase
+
+
+class Solution(NamedTuple):
+    module_name: str
+    part_one: str
+    part_two: str
+
+
+SOLUTIONS: dict[int, Solution] = {
+    1: Solution("advent.solutions.day_01", "main_part_one_vectorized", "main_part_two"),
+    2: Solution("advent.solutions.day_02", "main_part_one", "main_part_two"),
+    3: Solution("advent.solutions.day_03", "main_part_one", "main_part_two"),
+    4: Solution("advent.solutions.day_04", "main_part_one", "count_all_cards"),
+    5: Solution("advent.solutions.day_05", "main_part_one", "main_part_two"),
+    6: Solution("advent.solutions.day_06", "main_part_one", "main_part_two"),
+    7: Solution("advent.solutions.day_07", "main_part_one", "main_part_two"),
+    8: Solution(
+        "advent.solutions.day_08",
+        "find_destination_part_one",
+        "find_destination_part_two_smart"
+    ),
+}
+PARTS = (1, 2)
+
+
+def load_part(day: int, part: int) -> Callable[..., Any]:
+    """
+    Import the solution module of the given day, and return the function
+    solving the given part. The function takes the input file path as
+    its first argument.
+    """
+    try:
+        solution = SOLUTIONS[day]
+    except KeyError:
+        raise ValueError(f"There is no solution for day {day}") from None
+    if part not in PARTS:
+        raise ValueError(f"There is no part {part}, only parts {PARTS}")
+    module = importlib.import_module(solution.module_name)
+    function_name = solution.part_one if part == 1 else solution.part_two
+    return getattr(module, function_name)
+
+
+def default_input_file_path(day: int) -> Path:
+    """Return the path of the checked in puzzle input of the given day"""
+    module = importlib.import_module(SOLUTIONS[day].module_name)
+    return module.INPUT_FILE_PATH
+
+
+def run_part(
+    day: int,
+    part: int,
+    input_file_path: Optional[str | Path | BinaryIO] = None,
+    verbose: bool = False
+) -> Any:
+    """
+    Solve the given part of the given day and return the answer. The input
+    can be given as a file path or as a binary stream. Unless verbose is set,
+    anything the solution prints along the way is discarded.
+    """
+    function = load_part(day, part)
+    if input_file_path is None:
+        input_file_path = default_input_file_path(day)
+    with phase(f"day_{day:02}.part_{part}"):
+        if verbose:
+            return function(input_file_path)
+        # print() does nothing at all when sys.stdout is None
+        with contextlib.redirect_stdout(None):
+            return function(input_file_path)
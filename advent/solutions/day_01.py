@@ -9,14 +9,26 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 
+from dataclasses import asdict, dataclass
+import json
 import re
 import time
-from typing import Optional
-from advent.common import yield_lines, INPUTS_FOLDER
+from typing import Callable, Generator, Iterable, Optional
+from advent.common import map_bytes, map_reduce_lines, write_text_atomically, InputSource, INPUTS_FOLDER
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "1.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 
+# first digit of a line, and the rest of the line, so that the next match
+# starts on the next line
+FIRST_DIGIT_PATTERN = re.compile(rb"(\d)[^\n]*")
+# last digit of a line: from the start of the line, the greedy [^\n]* runs
+# to the end of the line and backtracks to its last digit
+LAST_DIGIT_PATTERN = re.compile(rb"^[^\n]*(\d)", re.MULTILINE)
+
+FOLLOW_CHUNK_SIZE = 1 << 24  # bytes
+
 def extract_number(amended_calibration: str) -> int:
     """
     Extract the calibration value from the input string, by combining 
@@ -35,90 +47,296 @@ def extract_number(amended_calibration: str) -> int:
     number = first_digit + second_digit
     return int(number)
 
-def extract_number_spelled(amended_calibration: str) -> int:
+DIGITS = {str(digit): digit for digit in range(10)}
+SPELLED_DIGITS = DIGITS | {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9
+}
+
+
+class WordAutomaton:
+    """
+    Aho-Corasick automaton over a set of words, compiled to a table of
+    transitions for every state, so that scanning a text costs a single dict
+    lookup per character, no matter how many words there are.
+    """
+    __slots__ = ("transitions", "match_lengths", "match_values")
+
+    def __init__(self, words: dict[str, int]) -> None:
+        if not words or "" in words:
+            raise ValueError("Words have to be non empty")
+        # trie of the words, state 0 being the root
+        children: list[dict[str, int]] = [{}]
+        match_lengths = [0]
+        match_values = [0]
+        for word, value in words.items():
+            state = 0
+            for char in word:
+                if char not in children[state]:
+                    children[state][char] = len(children)
+                    children.append({})
+                    match_lengths.append(0)
+                    match_values.append(0)
+                state = children[state][char]
+            match_lengths[state] = len(word)
+            match_values[state] = value
+        # breadth first, turn the trie into a complete transition table,
+        # following failure links wherever the trie has no child
+        alphabet = set("".join(words))
+        transitions: list[dict[str, int]] = [{} for _ in children]
+        failure_links = [0] * len(children)
+        queue = []
+        for char in alphabet:
+            child = children[0].get(char, 0)
+            transitions[0][char] = child
+            if child:
+                queue.append(child)
+        for state in queue:
+            failure_state = failure_links[state]
+            # a word ending in the failure state also ends here - the longest
+            # one wins, as it is the one starting the earliest
+            if match_lengths[failure_state] > match_lengths[state]:
+                match_lengths[state] = match_lengths[failure_state]
+                match_values[state] = match_values[failure_state]
+            for char in alphabet:
+                child = children[state].get(char)
+                if child is None:
+                    transitions[state][char] = transitions[failure_state][char]
+                else:
+                    transitions[state][char] = child
+                    failure_links[child] = transitions[failure_state][char]
+                    queue.append(child)
+        # characters outside of the alphabet always lead back to the root
+        for state_transitions in transitions:
+            for char, next_state in list(state_transitions.items()):
+                if next_state == 0:
+                    del state_transitions[char]
+        self.transitions = transitions
+        self.match_lengths = match_lengths
+        self.match_values = match_values
+
+
+class WordMatcher:
+    """
+    Finds the first and the last word of a vocabulary occurring in a text,
+    overlapping words included (in "eightwo", "eight" comes first and "two"
+    comes last). Words are mapped to values, which get returned instead of
+    the words themselves.
+    """
+    __slots__ = ("forward", "backward", "max_length")
+
+    def __init__(self, words: dict[str, int]) -> None:
+        self.forward = WordAutomaton(words)
+        # the last word of a text is the first word of the reversed text,
+        # using the reversed words
+        self.backward = WordAutomaton(
+            {word[::-1]: value for word, value in words.items()}
+        )
+        self.max_length = max(len(word) for word in words)
+
+    def _find_first(self, chars: Iterable[str], automaton: WordAutomaton) -> Optional[int]:
+        transitions = automaton.transitions
+        match_lengths = automaton.match_lengths
+        max_length = self.max_length
+        state = 0
+        best_start = -1
+        best_value = None
+        for index, char in enumerate(chars):
+            state = transitions[state].get(char, 0)
+            match_length = match_lengths[state]
+            if match_length:
+                start = index - match_length + 1
+                if best_value is None or start <= best_start:
+                    best_start = start
+                    best_value = automaton.match_values[state]
+            # words ending later than this start too late to come first
+            if best_value is not None and index - max_length + 2 > best_start:
+                break
+        return best_value
+
+    def first(self, text: str) -> Optional[int]:
+        """Return the value of the word occurring first in text, if any"""
+        return self._find_first(text, self.forward)
+
+    def last(self, text: str) -> Optional[int]:
+        """Return the value of the word occurring last in text, if any"""
+        return self._find_first(reversed(text), self.backward)
+
+
+SPELLED_DIGIT_MATCHER = WordMatcher(SPELLED_DIGITS)
+
+
+def extract_number_spelled(
+    amended_calibration: str,
+    matcher: WordMatcher = SPELLED_DIGIT_MATCHER
+) -> int:
     """
     Extract the calibration value from the input string. Same principle as 
     above, except that digits can now also be spelled out ('one', 'two'..'nine')
     """
-    number_mapping = {
-        "one": 1,
-        "two": 2,
-        "three": 3,
-        "four": 4,
-        "five": 5,
-        "six": 6,
-        "seven": 7,
-        "eight": 8,
-        "nine": 9
-    }
-    first_digit_index: Optional[int] = None
-    last_digit_index: Optional[int] = None
-    for i in range(len(amended_calibration)):
-        if amended_calibration[i].isdigit():
-            first_digit_index = i
-            break
-    if first_digit_index is not None:
-        for i in range(len(amended_calibration) - 1, -1, -1):
-            if amended_calibration[i].isdigit():
-                last_digit_index = i
-                break
-    substring_indices = {
-        "one": None,
-        "two": None,
-        "three": None,
-        "four": None,
-        "five": None,
-        "six": None,
-        "seven": None,
-        "eight": None,
-        "nine": None
-    }
-    for written_number in substring_indices:
-        indices = [i.start() for i in re.finditer(written_number, amended_calibration)]
-        substring_indices[written_number] = indices
-    first_number = None
-    lowest_index = len(amended_calibration)
-    last_number = None
-    highest_index = -1
-    if first_digit_index is not None:
-        lowest_index = first_digit_index
-        first_number = int(amended_calibration[first_digit_index])
-    if last_digit_index is not None:
-        highest_index = last_digit_index
-        last_number = int(amended_calibration[last_digit_index])
-    for written_number, indices in substring_indices.items():
-        if len(indices) > 0:
-            minimum = min(indices)
-            maximum = max(indices)
-            if minimum < lowest_index:
-                lowest_index = minimum
-                first_number = number_mapping[written_number]
-            if maximum > highest_index:
-                highest_index = maximum
-                last_number = number_mapping[written_number]
-    return (10 * first_number) + last_number
-
-
-def main_part_one() -> None:
-    total = 0
-    for line in yield_lines(INPUT_FILE_PATH):
-        calibration = extract_number(line)
-        total += calibration
-    print(f"The total is {total}")
-
-
-def main_part_two() -> None:
-    start_time = time.perf_counter()
-    total = 0
-    for line in yield_lines(INPUT_FILE_PATH):
-        calibration = extract_number_spelled(line)
-        total += calibration
-    end_time = time.perf_counter()
-    print(f"The total is {total}")
-    elapsed_time = (end_time - start_time) * 1_000
-    print(f"The function took {elapsed_time} ms to run")
+    first_digit = matcher.first(amended_calibration)
+    if first_digit is None:
+        raise ValueError(f"No digit in {amended_calibration!r}")
+    return (10 * first_digit) + matcher.last(amended_calibration)
+
+
+def main_part_one(
+    input_file_path: InputSource = INPUT_FILE_PATH,
+    workers: int = 1
+) -> int:
+    with phase("day_01.part_1.solve") as solve_phase:
+        run = map_reduce_lines(input_file_path, extract_number, workers=workers)
+        solve_phase.add_items(run.line_count)
+    with phase("day_01.part_1.output"):
+        print(f"The total is {run.result}")
+        print(run.report())
+    return run.result
+
+
+def sum_digits(digits: bytes) -> int:
+    return sum(digit * digits.count(b"%d" % digit) for digit in range(1, 10))
 
 
+def sum_calibration_values(buffer: bytes) -> int:
+    """
+    Sum the calibration values of every line of the buffer at once, without
+    running any Python code per line. The first digits of all lines are
+    collected by a single regex scan over the buffer, and so are the last
+    digits, by another one, without copying the buffer.
+    Lines without digits are skipped.
+    """
+    first_digits = b"".join(FIRST_DIGIT_PATTERN.findall(buffer))
+    last_digits = b"".join(LAST_DIGIT_PATTERN.findall(buffer))
+    return 10 * sum_digits(first_digits) + sum_digits(last_digits)
+
+
+def main_part_one_vectorized(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    """Same as main_part_one, summing the whole file at once"""
+    with phase("day_01.part_1.solve"):
+        with map_bytes(input_file_path) as buffer:
+            total = sum_calibration_values(buffer)
+    with phase("day_01.part_1.output"):
+        print(f"The total is {total}")
+    return total
+
+
+def main_part_two(
+    input_file_path: InputSource = INPUT_FILE_PATH,
+    workers: int = 1
+) -> int:
+    with phase("day_01.part_2.solve") as solve_phase:
+        run = map_reduce_lines(input_file_path, extract_number_spelled, workers=workers)
+        solve_phase.add_items(run.line_count)
+    with phase("day_01.part_2.output"):
+        print(f"The total is {run.result}")
+        print(run.report())
+    return run.result
+
+
+
+def sum_spelled_calibration_values(buffer: bytes) -> int:
+    """Sum the calibration values of every line of the buffer, spelled digits included"""
+    return sum(
+        extract_number_spelled(line)
+        for line in buffer.decode().splitlines()
+        if line
+    )
+
+
+@dataclass(slots=True)
+class FollowState:
+    """
+    How far a growing calibration file has been summed: the total of all
+    complete lines before offset, in the file with the given inode, as
+    computed by the sum function with the given name.
+    """
+    offset: int = 0
+    total: int = 0
+    inode: int = 0
+    sum_function_name: str = ""
+
+    @classmethod
+    def load(cls, state_file_path: str | Path) -> "FollowState":
+        """Load a saved state, or start from scratch when there is none"""
+        try:
+            with open(state_file_path, "r") as file:
+                return cls(**json.load(file))
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, state_file_path: str | Path) -> None:
+        write_text_atomically(state_file_path, json.dumps(asdict(self)))
+
+
+def update_total(
+    input_file_path: str | Path,
+    state: FollowState,
+    sum_function: Callable[[bytes], int] = sum_calibration_values
+) -> FollowState:
+    """
+    Add the calibration values of the lines appended to the file since the
+    given state to its total. A final line without newline is still being
+    written, so it is left for the next update. When the file got truncated
+    or replaced by another one, or the total was computed by another sum
+    function, the total starts again from scratch.
+    """
+    sum_function_name = sum_function.__qualname__
+    with open(input_file_path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        if (
+            stat.st_ino != state.inode
+            or stat.st_size < state.offset
+            or state.sum_function_name != sum_function_name
+        ):
+            state = FollowState(inode=stat.st_ino, sum_function_name=sum_function_name)
+        else:
+            state = FollowState(state.offset, state.total, state.inode, sum_function_name)
+        file.seek(state.offset)
+        partial_line = b""
+        while chunk := file.read(FOLLOW_CHUNK_SIZE):
+            chunk = partial_line + chunk
+            lines_end = chunk.rfind(b"\n") + 1
+            state.total += sum_function(chunk[:lines_end])
+            state.offset += lines_end
+            partial_line = chunk[lines_end:]
+    return state
+
+
+def follow(
+    input_file_path: str | Path,
+    state_file_path: str | Path,
+    sum_function: Callable[[bytes], int] = sum_calibration_values,
+    interval: float = 1.0
+) -> Generator[FollowState, None, None]:
+    """
+    Watch a calibration file which keeps growing, yielding the state with
+    the updated total every time lines get appended. The state is saved to
+    state_file_path after every update, so that following the file again
+    later resumes where it stopped instead of summing it from the start.
+
+    :param input_file_path: path of the calibration file
+    :param state_file_path: path of the JSON file keeping the state
+    :param sum_function: sums the calibration values of complete lines
+    :param interval: seconds to wait between checks of the file
+    """
+    state = FollowState.load(state_file_path)
+    first_update = True
+    while True:
+        new_state = update_total(input_file_path, state, sum_function)
+        if new_state != state or first_update:
+            state = new_state
+            state.save(state_file_path)
+            first_update = False
+            yield state
+        time.sleep(interval)
+
 if __name__ == "__main__":
     main_part_two()
     
\ No newline at end of file
@@ -3,6 +3,8 @@ My main challenge with today's puzzle was that I wanted to achieve
 the given tasks with a single iteration over the given string, only looking
 at each character once.
 """
+from __future__ import annotations
+
 import sys
 import os
 from pathlib import Path
@@ -14,9 +16,16 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 
-import time
-from typing import NamedTuple, Optional
-from advent.common import yield_lines, INPUTS_FOLDER, find_number_end, find_number_beginning
+from array import array
+import bisect
+from dataclasses import dataclass
+import itertools
+import math
+import re
+from typing import Iterable, NamedTuple, Optional, Sequence
+from advent.cache import disk_cache
+from advent.common import map_bytes, InputSource, INPUTS_FOLDER, find_number_end, find_number_beginning
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "2.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
@@ -135,13 +144,6 @@ def is_hand_possible(
 
     return HandResult(has_game_ended, is_hand_possible, color_end)
 
-def main_part_one() -> None:
-    total = 0
-    for line in yield_lines(INPUT_FILE_PATH):
-        total += is_game_possible(line, 12, 13, 14)
-    print(f"The total is {total}")
-
-
 class HandResults(NamedTuple):
     red_cubes: int
     green_cubes: int
@@ -210,14 +212,205 @@ def cube_power_set(game_input: str) -> int:
     return max_red_count * max_green_count * max_blue_count
 
 
-def main_part_two() -> None:
-    total = 0
-    for line in yield_lines(INPUT_FILE_PATH):
-        power_set = cube_power_set(line)
-        total += power_set
-    print(f"The total is {total}")
+GAME_RECORD_PATTERN = re.compile(rb"Game (\d+)|(\d+) ([a-z]+)")
+DEFAULT_COLORS = ("red", "green", "blue")
+# maximum number of cells of a feasibility index, which has one cell for
+# every combination of distinct cube counts of the colors
+MAX_INDEX_CELLS = 1 << 24
 
 
+@dataclass(slots=True)
+class GameTable:
+    """
+    Maximum number of cubes of every color shown in each game. Colors are
+    numbered in order of appearance in the game log, and the maxima are
+    stored column major, a column per color with a row for every game, so
+    maxima[color_id * len(game_ids) + row] is the maximum of the given color
+    in the game of the given row.
+    """
+    game_ids: array
+    colors: list[str]
+    color_ids: dict[str, int]
+    maxima: array
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes) -> GameTable:
+        """Build the table from the whole game log, with a single regex scan"""
+        game_ids = array("q")
+        colors: list[str] = []
+        color_ids: dict[str, int] = {}
+        columns_by_name: dict[bytes, array] = {}
+        columns: list[array] = []
+        row = -1
+        for game_id, count, color in GAME_RECORD_PATTERN.findall(buffer):
+            if game_id:
+                game_ids.append(int(game_id))
+                row += 1
+                continue
+            column = columns_by_name.get(color)
+            if column is None:
+                name = color.decode()
+                color_ids[name] = len(colors)
+                colors.append(name)
+                column = columns_by_name[color] = array("q")
+                columns.append(column)
+            if len(column) <= row:
+                # games without cubes of this color show none of them
+                column.frombytes(bytes(column.itemsize * (row + 1 - len(column))))
+            count = int(count)
+            if count > column[row]:
+                column[row] = count
+        maxima = array("q")
+        for column in columns:
+            column.frombytes(bytes(column.itemsize * (len(game_ids) - len(column))))
+            maxima.extend(column)
+        return cls(game_ids, colors, color_ids, maxima)
+
+    def __len__(self) -> int:
+        return len(self.game_ids)
+
+    def column(self, color: str) -> Sequence[int]:
+        """
+        Maxima of the given color for every game, all zero for colors which
+        never appear in the game log
+        """
+        color_id = self.color_ids.get(color)
+        if color_id is None:
+            return array("q", bytes(8 * len(self.game_ids)))
+        row_count = len(self.game_ids)
+        return memoryview(self.maxima)[color_id * row_count:(color_id + 1) * row_count]
+
+    def sum_possible_game_ids(self, limits: dict[str, int]) -> int:
+        """
+        Sum the ids of the games possible with the given numbers of cubes per
+        color. There is no limit on colors missing from limits.
+        """
+        # one byte per game, 1 when the game is possible, combined over
+        # all colors as a single big integer
+        possible = int.from_bytes(b"\x01" * len(self.game_ids), "little")
+        for color, limit in limits.items():
+            column_possible = bytes(map(limit.__ge__, self.column(color)))
+            possible &= int.from_bytes(column_possible, "little")
+        mask = possible.to_bytes(len(self.game_ids), "little")
+        return sum(itertools.compress(self.game_ids, mask))
+
+    def sum_power_sets(self, colors: Sequence[str] = DEFAULT_COLORS) -> int:
+        """
+        Sum the powers (product over the given colors) of the minimal cube
+        sets of every game. A game without cubes of one of the colors has
+        a power of 0, whatever the other games hold.
+        """
+        return sum(map(math.prod, zip(*map(self.column, colors))))
+
+    def feasibility_index(self, colors: Sequence[str] = DEFAULT_COLORS) -> FeasibilityIndex:
+        """Index of the games for limits on the given colors, in that order"""
+        return FeasibilityIndex(self.game_ids, [self.column(color) for color in colors])
+
+
+class FeasibilityIndex:
+    """
+    Answers which games are possible for many different cube limits, without
+    going through every game for each of them.
+
+    Every game is a point whose coordinates are its maximum cube counts, and
+    a game is possible when its point is dominated by the limits (no greater
+    in any coordinate). The cube counts of every color are compressed to
+    their distinct values, and a table with a cell for every combination of
+    them holds the sum of the ids of all the games dominated by that cell,
+    so that a query only has to find its cell, with a binary search per color.
+    """
+    __slots__ = ("values", "strides", "sums")
+
+    def __init__(self, game_ids: Sequence[int], columns: Sequence[Sequence[int]]) -> None:
+        self.values = [sorted(set(column)) for column in columns]
+        shape = [len(values) for values in self.values]
+        cell_count = math.prod(shape)
+        if cell_count > MAX_INDEX_CELLS:
+            raise ValueError(
+                f"Too many distinct cube counts to index ({cell_count} combinations)"
+            )
+        # row major strides, the last color being contiguous
+        self.strides = [math.prod(shape[dimension + 1:]) for dimension in range(len(shape))]
+        sums = array("q", bytes(8 * cell_count))
+        positions = [
+            {value: position for position, value in enumerate(values)}
+            for values in self.values
+        ]
+        for row, game_id in enumerate(game_ids):
+            cell = 0
+            for column, position, stride in zip(columns, positions, self.strides):
+                cell += position[column[row]] * stride
+            sums[cell] += game_id
+        # turn the sums of every cell into the sums of everything they dominate,
+        # by accumulating along one dimension after the other
+        for size, stride in zip(shape, self.strides):
+            for cell in range(cell_count):
+                if (cell // stride) % size:
+                    sums[cell] += sums[cell - stride]
+        self.sums = sums
+
+    def query(self, limits: Sequence[int]) -> int:
+        """Sum the ids of the games possible with the given cube limits, one per color"""
+        cell = 0
+        for values, stride, limit in zip(self.values, self.strides, limits):
+            position = bisect.bisect_right(values, limit) - 1
+            if position < 0:
+                return 0
+            cell += position * stride
+        return self.sums[cell]
+
+    def query_many(self, limits_batch: Iterable[Sequence[int]]) -> list[int]:
+        return [self.query(limits) for limits in limits_batch]
+
+
+@disk_cache(version=2)
+def parse_game_table(input_file_path: InputSource) -> GameTable:
+    with map_bytes(input_file_path) as buffer:
+        return GameTable.from_buffer(buffer)
+
+
+def main_part_one(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_02.part_1.parse") as parse_phase:
+        table = parse_game_table(input_file_path)
+        parse_phase.add_items(len(table))
+    with phase("day_02.part_1.solve"):
+        total = table.sum_possible_game_ids({"red": 12, "green": 13, "blue": 14})
+    with phase("day_02.part_1.output"):
+        print(f"The total is {total}")
+    return total
+
+
+def main_part_two(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_02.part_2.parse") as parse_phase:
+        table = parse_game_table(input_file_path)
+        parse_phase.add_items(len(table))
+    with phase("day_02.part_2.solve"):
+        total = table.sum_power_sets()
+    with phase("day_02.part_2.output"):
+        print(f"The total is {total}")
+    return total
+
+
+def sum_possible_game_ids_many(
+    input_file_path: InputSource,
+    limits_batch: Iterable[Sequence[int]],
+    colors: Sequence[str] = DEFAULT_COLORS
+) -> list[int]:
+    """
+    For every limits of the batch, which hold the maximum number of cubes of
+    each of the given colors, sum the ids of the games of the game log which
+    are possible with these numbers of cubes
+    """
+    with phase("day_02.batch.parse") as parse_phase:
+        table = parse_game_table(input_file_path)
+        parse_phase.add_items(len(table))
+    with phase("day_02.batch.index"):
+        index = table.feasibility_index(colors)
+    with phase("day_02.batch.query") as query_phase:
+        totals = index.query_many(limits_batch)
+        query_phase.add_items(len(totals))
+    return totals
+
 
 if __name__ == "__main__":
     main_part_two()
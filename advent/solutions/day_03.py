@@ -9,12 +9,32 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 
+from array import array
+import itertools
+import math
+import mmap
+import re
 import time
-from advent.common import read_file_to_list_of_stripped_lines, INPUTS_FOLDER, find_number_end, find_number_beginning
+from typing import Generator, Iterable, Iterator, NamedTuple, Optional
+from advent.common import (
+    INPUTS_FOLDER,
+    SYMBOL_TABLE,
+    Grid,
+    InputSource,
+    find_number_beginning,
+    find_number_end,
+    is_file_path,
+    map_reduce_ranges,
+    open_binary,
+    read_file_to_list_of_stripped_lines
+)
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "3.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 
+NUMBER_PATTERN = re.compile(rb"\d+")
+
 
 def sum_engine_part_numbers(schematic: list[str]) -> int:
     total = 0
@@ -115,10 +135,37 @@ def get_surrounding_indices(
     return surrounding_indices
 
 
-def main_part_one() -> None:
-    input = read_file_to_list_of_stripped_lines(INPUT_FILE_PATH)
-    engine_parts_sum = sum_engine_part_numbers(input)
-    print(f"The engine parts sum is {engine_parts_sum}")
+def sum_part_numbers(grid: Grid) -> int:
+    """
+    Same as sum_engine_part_numbers, working on a whole grid at once. Cells
+    near a symbol are found in one go, by dilating the mask of symbols, after
+    which a number is a part number when any cell it spans is near a symbol.
+    """
+    near_symbol = grid.dilate(grid.symbol_mask())
+    return sum(
+        int(match.group())
+        for match in NUMBER_PATTERN.finditer(grid.cells)
+        if 1 in near_symbol[match.start():match.end()]
+    )
+
+
+def main_part_one(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    if not is_file_path(input_file_path):
+        # streams are read row by row instead of as a whole grid
+        with phase("day_03.part_1.solve") as solve_phase:
+            engine_parts_sum, row_count = sum_row_sums(stream_part_number_sums(input_file_path))
+            solve_phase.add_items(row_count)
+        with phase("day_03.part_1.output"):
+            print(f"The engine parts sum is {engine_parts_sum}")
+        return engine_parts_sum
+    with phase("day_03.part_1.parse") as parse_phase:
+        grid = Grid.from_file(input_file_path)
+        parse_phase.add_items(grid.height)
+    with phase("day_03.part_1.solve"):
+        engine_parts_sum = sum_part_numbers(grid)
+    with phase("day_03.part_1.output"):
+        print(f"The engine parts sum is {engine_parts_sum}")
+    return engine_parts_sum
 
 
 def get_surrounding_numbers(
@@ -215,10 +262,310 @@ def sum_gear_ratios(schematic: list[str]) -> int:
     return total
 
 
-def main_part_two() -> None:
-    input = read_file_to_list_of_stripped_lines(INPUT_FILE_PATH)
-    result = sum_gear_ratios(input)
-    print(f"The sum of gear ratios is {result}")
+class SchematicIndex:
+    """
+    Numbers and symbols of a schematic, indexed for adjacency queries.
+
+    Every number gets an id, starting at 1, and labels holds the id of the
+    number every cell of the grid belongs to (0 for cells which are not part
+    of a number), at the same flat indices as the cells of the grid. The
+    distinct numbers around any cell are then just a lookup of the labels
+    of its 8 neighbours.
+    """
+    __slots__ = ("grid", "labels", "values", "symbol_indices")
+
+    def __init__(self, grid: Grid) -> None:
+        self.grid = grid
+        # values[number_id] is the value of the number, there is no number 0
+        values = array("q", [0])
+        labels = array("i", [0]) * len(grid.cells)
+        append_value = values.append
+        for number_id, match in enumerate(NUMBER_PATTERN.finditer(grid.cells), 1):
+            start, end = match.span()
+            append_value(int(match[0]))
+            # numbers are a few digits long, so cells are set one by one
+            for index in range(start, end):
+                labels[index] = number_id
+        self.values = values
+        self.labels = labels
+        self.symbol_indices = array("q")
+        symbol_mask = grid.symbol_mask()
+        index = symbol_mask.find(1)
+        while index != -1:
+            self.symbol_indices.append(index)
+            index = symbol_mask.find(1, index + 1)
+
+    @classmethod
+    def from_file(cls, file_path: InputSource) -> "SchematicIndex":
+        return cls(Grid.from_file(file_path))
+
+    def adjacent_numbers(self, index: int) -> list[int]:
+        """Return the ids of the distinct numbers around the cell at given flat index"""
+        labels = self.labels
+        number_ids = []
+        for offset in self.grid.neighbour_offsets:
+            number_id = labels[index + offset]
+            if number_id and number_id not in number_ids:
+                number_ids.append(number_id)
+        return number_ids
+
+    def symbols(self, symbol_class: Optional[str] = None) -> Iterator[int]:
+        """
+        Yield the flat indices of all symbols, or only of the ones which are
+        one of the characters of symbol_class
+        """
+        if symbol_class is None:
+            yield from self.symbol_indices
+            return
+        wanted = symbol_class.encode()
+        cells = self.grid.cells
+        for index in self.symbol_indices:
+            if cells[index] in wanted:
+                yield index
+
+    def symbols_with_adjacent_numbers(
+        self,
+        count: int,
+        symbol_class: Optional[str] = None
+    ) -> Iterator[tuple[int, list[int]]]:
+        """
+        Yield the flat index of every symbol (of symbol_class, if given) with
+        exactly count adjacent numbers, together with the ids of these numbers
+        """
+        for index in self.symbols(symbol_class):
+            number_ids = self.adjacent_numbers(index)
+            if len(number_ids) == count:
+                yield index, number_ids
+
+    def numbers_adjacent_to(self, symbol_class: Optional[str] = None) -> set[int]:
+        """Return the ids of all numbers adjacent to symbols (of symbol_class, if given)"""
+        number_ids = set()
+        for index in self.symbols(symbol_class):
+            number_ids.update(self.adjacent_numbers(index))
+        return number_ids
+
+    def sum_part_numbers(self) -> int:
+        return sum(self.values[number_id] for number_id in self.numbers_adjacent_to())
+
+    def sum_gear_ratios(self) -> int:
+        """Sum the products of the two numbers around every * with exactly two numbers"""
+        values = self.values
+        return sum(
+            math.prod(values[number_id] for number_id in number_ids)
+            for _, number_ids in self.symbols_with_adjacent_numbers(2, "*")
+        )
+
+
+class SchematicRow(NamedTuple):
+    cells: bytes
+    # one byte per cell, 1 for symbols, as a little endian integer
+    symbols: int
+    # start, end (exclusive) and value of every number of the row
+    numbers: list[tuple[int, int, int]]
+
+    @classmethod
+    def parse(cls, cells: bytes) -> "SchematicRow":
+        numbers = [
+            (match.start(), match.end(), int(match.group()))
+            for match in NUMBER_PATTERN.finditer(cells)
+        ]
+        return cls(cells, int.from_bytes(cells.translate(SYMBOL_TABLE), "little"), numbers)
+
+
+EMPTY_ROW = SchematicRow(b"", 0, [])
+
+RowWindow = tuple[SchematicRow, SchematicRow, SchematicRow]
+
+
+def yield_rows(input_file_path: InputSource) -> Generator[bytes, None, None]:
+    """Yield the rows of a schematic one by one, without line endings"""
+    with open_binary(input_file_path) as reader:
+        for line in reader:
+            yield line.rstrip(b"\r\n")
+
+
+def yield_row_windows(rows: Iterable[bytes]) -> Generator[RowWindow, None, None]:
+    """
+    Yield every row of a schematic together with the rows above and below it,
+    which is all that is needed to find what is adjacent to the row. Only
+    these three rows are held at any time, and every row gets parsed once.
+    Rows beyond the edges of the schematic are empty.
+    """
+    previous_row = EMPTY_ROW
+    current_row = None
+    for cells in rows:
+        next_row = SchematicRow.parse(cells)
+        if current_row is not None:
+            yield previous_row, current_row, next_row
+            previous_row = current_row
+        current_row = next_row
+    if current_row is not None:
+        yield previous_row, current_row, EMPTY_ROW
+
+
+def sum_row_part_numbers(window: RowWindow) -> int:
+    """Sum the part numbers of the middle row of the window"""
+    previous_row, current_row, next_row = window
+    symbols = previous_row.symbols | current_row.symbols | next_row.symbols
+    if not symbols:
+        return 0
+    width = len(current_row.cells)
+    # rows above and below can be wider, so cut off their symbols beyond
+    # the end of the current row
+    near_symbol_bits = (symbols | symbols << 8 | symbols >> 8) & ((1 << 8 * width) - 1)
+    near_symbol = near_symbol_bits.to_bytes(width, "little")
+    return sum(
+        value
+        for start, end, value in current_row.numbers
+        if 1 in near_symbol[start:end]
+    )
+
+
+def sum_row_gear_ratios(window: RowWindow) -> int:
+    """Sum the gear ratios of the gears of the middle row of the window"""
+    cells = window[1].cells
+    total = 0
+    column = cells.find(b"*")
+    while column != -1:
+        adjacent_numbers = [
+            value
+            for row in window
+            for start, end, value in row.numbers
+            if start <= column + 1 and end >= column
+        ]
+        if len(adjacent_numbers) == 2:
+            total += adjacent_numbers[0] * adjacent_numbers[1]
+        column = cells.find(b"*", column + 1)
+    return total
+
+
+def stream_part_number_sums(input_file_path: InputSource) -> Iterator[int]:
+    """
+    Same as sum_engine_part_numbers, reading the schematic row by row, in
+    constant memory. Yields the sum of the part numbers of every row as soon
+    as the row below it has been read.
+    """
+    return map(sum_row_part_numbers, yield_row_windows(yield_rows(input_file_path)))
+
+
+def stream_gear_ratio_sums(input_file_path: InputSource) -> Iterator[int]:
+    """
+    Same as sum_gear_ratios, reading the schematic row by row, in constant
+    memory. Yields the sum of the gear ratios of every row as soon as
+    the row below it has been read.
+    """
+    return map(sum_row_gear_ratios, yield_row_windows(yield_rows(input_file_path)))
+
+
+def sum_row_sums(row_sums: Iterable[int]) -> tuple[int, int]:
+    """Add up the sums of every row of a streamed schematic, returning the total and the row count"""
+    total = 0
+    row_count = 0
+    for row_sum in row_sums:
+        total += row_sum
+        row_count += 1
+    return total, row_count
+
+
+class TileSums(NamedTuple):
+    part_numbers: int
+    gear_ratios: int
+
+
+def add_tile_sums(sums: TileSums, other_sums: TileSums) -> TileSums:
+    return TileSums(
+        sums.part_numbers + other_sums.part_numbers,
+        sums.gear_ratios + other_sums.gear_ratios
+    )
+
+
+def sum_tile(
+    input_file_path: InputSource,
+    range_start: int = 0,
+    range_end: Optional[int] = None
+) -> tuple[TileSums, int]:
+    """
+    Sum the part numbers and gear ratios of the rows of a schematic file
+    within the given byte range, which has to start at the beginning of
+    a row and end just after one (None meaning the end of the file).
+    Return the sums and the number of rows summed.
+
+    The rows just above and below the range are read as well, as a halo, so
+    that whatever is adjacent to the rows of the tile is seen, but only the
+    rows of the tile itself are summed. Every row belongs to exactly one
+    tile, so numbers and gears along tile boundaries are counted once.
+
+    A stream is a single tile, which gets read row by row.
+    """
+    if not is_file_path(input_file_path):
+        tile_windows = yield_row_windows(yield_rows(input_file_path))
+    else:
+        with open(input_file_path, "rb") as reader, \
+                mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            file_size = len(mapped_file)
+            if range_end is None:
+                range_end = file_size
+            halo_start = range_start
+            if range_start > 0:
+                halo_start = mapped_file.rfind(b"\n", 0, range_start - 1) + 1
+            halo_end = range_end
+            if range_end < file_size:
+                row_end = mapped_file.find(b"\n", range_end)
+                halo_end = file_size if row_end == -1 else row_end + 1
+            rows = mapped_file[halo_start:halo_end].splitlines()
+        rows_above = 1 if halo_start < range_start else 0
+        rows_below = 1 if halo_end > range_end else 0
+        tile_windows = itertools.islice(
+            yield_row_windows(rows),
+            rows_above,
+            len(rows) - rows_below
+        )
+    part_numbers = 0
+    gear_ratios = 0
+    row_count = 0
+    for window in tile_windows:
+        part_numbers += sum_row_part_numbers(window)
+        gear_ratios += sum_row_gear_ratios(window)
+        row_count += 1
+    return TileSums(part_numbers, gear_ratios), row_count
+
+
+def sum_schematic_tiled(
+    input_file_path: InputSource,
+    workers: Optional[int] = None
+) -> TileSums:
+    """
+    Sum the part numbers and the gear ratios of a schematic, splitting it
+    into horizontal tiles which are processed in parallel by a pool of
+    worker processes, see sum_tile and map_reduce_ranges.
+
+    :param input_file_path: path of the schematic file, or a binary stream
+    :param workers: number of worker processes, defaults to the CPU count,
+        with 1 everything is done in the current process
+    """
+    run = map_reduce_ranges(input_file_path, sum_tile, add_tile_sums, TileSums(0, 0), workers)
+    return run.result
+
+
+def main_part_two(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    if not is_file_path(input_file_path):
+        # streams are read row by row instead of all at once
+        with phase("day_03.part_2.solve") as solve_phase:
+            result, row_count = sum_row_sums(stream_gear_ratio_sums(input_file_path))
+            solve_phase.add_items(row_count)
+        with phase("day_03.part_2.output"):
+            print(f"The sum of gear ratios is {result}")
+        return result
+    with phase("day_03.part_2.parse") as parse_phase:
+        schematic = read_file_to_list_of_stripped_lines(input_file_path)
+        parse_phase.add_items(len(schematic))
+    with phase("day_03.part_2.solve"):
+        # only the numbers around gears get parsed, which is cheaper than
+        # indexing every number like SchematicIndex does
+        result = sum_gear_ratios(schematic)
+    with phase("day_03.part_2.output"):
+        print(f"The sum of gear ratios is {result}")
+    return result
 
 
 if __name__ == "__main__":
@@ -9,63 +9,149 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 
-import re
-from advent.common import yield_lines, INPUTS_FOLDER, TEST_INPUTS_FOLDER
+from array import array
+from collections import deque
+import functools
+import operator
+from typing import Iterable
+from advent.cache import disk_cache
+from advent.common import map_reduce_lines, yield_lines_mmap, InputSource, INPUTS_FOLDER, TEST_INPUTS_FOLDER
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "4.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, INPUT_FILE_NAME)
 
 
-def count_duplicate_numbers(scratchcard: str) -> int:
-    """Count how many numbers occur twice in the given sting"""
-    count = 0
-    numbers_start = scratchcard.find(":")
-    numbers = re.findall(r'\d+', scratchcard[numbers_start + 1:])
-    numbers.sort()
-    for i in range(len(numbers) - 1):
-        if numbers[i] == numbers[i + 1]:
-            count += 1
-    return count
+# bits of the numbers found on puzzle scratchcards, looked up by their text
+# to spare parsing them
+SMALL_NUMBER_BITS = {str(number): 1 << number for number in range(100)}
+# larger numbers would make for huge bitmasks
+MAX_BITMASK_NUMBER = 4096
 
-def main_part_one(input_file_path: str | Path = INPUT_FILE_PATH):
-    total = 0
-    for scratchard in yield_lines(input_file_path):
-        winning_number_count = count_duplicate_numbers(scratchard)
-        if winning_number_count > 0:
-            total += 2 ** (winning_number_count - 1)
-    print(f"Total points from scratch cards: {total}")
+
+def to_bitmask(numbers: str) -> int:
+    """
+    Turn whitespace separated numbers into an integer with their bits set.
+    Raises ValueError for numbers above MAX_BITMASK_NUMBER.
+    """
+    tokens = numbers.split()
+    try:
+        return functools.reduce(operator.or_, map(SMALL_NUMBER_BITS.__getitem__, tokens), 0)
+    except KeyError:
+        values = list(map(int, tokens))
+        if max(values) > MAX_BITMASK_NUMBER:
+            raise ValueError(f"Numbers above {MAX_BITMASK_NUMBER} do not fit in a bitmask")
+        return functools.reduce(operator.or_, map((1).__lshift__, values), 0)
+
+
+def count_matches(scratchcard: str) -> int:
+    """
+    Count how many of the numbers held on the given scratchcard are winning
+    numbers, by turning both sets of numbers into bitmasks, or into sets when
+    they are too large for bitmasks
+    """
+    numbers = scratchcard[scratchcard.find(":") + 1:]
+    winning_numbers, _, held_numbers = numbers.partition("|")
+    try:
+        return (to_bitmask(winning_numbers) & to_bitmask(held_numbers)).bit_count()
+    except ValueError:
+        return len(set(map(int, winning_numbers.split())) & set(map(int, held_numbers.split())))
+
+
+def score(match_count: int) -> int:
+    return 1 << (match_count - 1) if match_count else 0
+
+
+def score_scratchcard(scratchcard: str) -> int:
+    """Compute how many points the given scratchcard is worth"""
+    return score(count_matches(scratchcard))
+
+
+@disk_cache(version=1)
+def parse_match_counts(input_file_path: InputSource) -> array:
+    """
+    Count the matches of every card of the given file, in order. Cards are
+    read one by one from a memory map (or from the stream), so only the
+    match counts are held in memory.
+    """
+    scratchcards = yield_lines_mmap(input_file_path, as_text=True)
+    return array("q", map(count_matches, filter(str.strip, scratchcards)))
+
+
+def main_part_one(
+    input_file_path: InputSource = INPUT_FILE_PATH,
+    workers: int = 1
+) -> int:
+    if workers != 1:
+        with phase("day_04.part_1.solve") as solve_phase:
+            run = map_reduce_lines(input_file_path, score_scratchcard, workers=workers)
+            solve_phase.add_items(run.line_count)
+        with phase("day_04.part_1.output"):
+            print(f"Total points from scratch cards: {run.result}")
+            print(run.report())
+        return run.result
+    with phase("day_04.part_1.parse") as parse_phase:
+        match_counts = parse_match_counts(input_file_path)
+        parse_phase.add_items(len(match_counts))
+    with phase("day_04.part_1.solve"):
+        total = sum(map(score, match_counts))
+    with phase("day_04.part_1.output"):
+        print(f"Total points from scratch cards: {total}")
     return total
 
 
-def count_points_for_every_card(input_file_path: str | Path) -> dict[int, int]:
-    points = {}
-    for scratchcard in yield_lines(input_file_path):
-        all_numbers = re.findall(r'\d+', scratchcard)
-        card_id = int(all_numbers[0])
-        duplicate_count = 0
-        unique_numbers = set()
-        for i in range(1, len(all_numbers)):
-            if all_numbers[i] in unique_numbers:
-                duplicate_count += 1
-            else:
-                unique_numbers.add(all_numbers[i])
-        points[card_id] = duplicate_count
-    return points
-
-
-def count_all_cards(input_file_path: str | Path) -> int:
-    all_card_points = count_points_for_every_card(input_file_path)
+def count_cards_from_matches(match_counts: Iterable[int]) -> int:
+    """
+    Count the scratchcards ending up in the pile, originals and copies
+    alike, given the number of matches of every card, in order.
+
+    Every copy of a card wins one copy of each of the next cards, as many as
+    it has matches, so all copies of a card add the same number of copies
+    to a run of the following cards. These additions are kept in a difference
+    array: the number of copies gets increased at the first card of the run,
+    and decreased again after its last one. Only the entries of the cards
+    ahead are kept, so memory depends on the largest number of matches
+    rather than on the number of cards.
+    """
     total = 0
-    all_cards = list(reversed(all_card_points.keys()))
-    while all_cards:
-        current_card = all_cards.pop()
-        total += 1
-        current_card_points = all_card_points[current_card]
-        for i in range(current_card + 1, current_card_points + current_card + 1):
-            all_cards.append(i)
+    extra_copies = 0
+    # copy count differences of the next cards, starting at the next one
+    differences: deque[int] = deque()
+    for matches in match_counts:
+        if differences:
+            extra_copies += differences.popleft()
+        copies = 1 + extra_copies
+        total += copies
+        if matches:
+            while len(differences) <= matches:
+                differences.append(0)
+            differences[0] += copies
+            differences[matches] -= copies
+    return total
+
+
+def count_cards(scratchcards: Iterable[str]) -> int:
+    """
+    Count the scratchcards ending up in the pile, going through the cards
+    once, in order, see count_cards_from_matches
+    """
+    return count_cards_from_matches(
+        count_matches(scratchcard) for scratchcard in scratchcards if scratchcard.strip()
+    )
+
+
+def count_all_cards(input_file_path: InputSource) -> int:
+    with phase("day_04.part_2.parse") as parse_phase:
+        match_counts = parse_match_counts(input_file_path)
+        parse_phase.add_items(len(match_counts))
+    with phase("day_04.part_2.solve") as solve_phase:
+        total = count_cards_from_matches(match_counts)
+        solve_phase.add_items(total)
+    with phase("day_04.part_2.output"):
+        print(f"Total number of scratchcards: {total}")
     return total
 
 
 if __name__ == "__main__":
-    print(count_all_cards(INPUT_FILE_PATH))
\ No newline at end of file
+    count_all_cards(INPUT_FILE_PATH)
\ No newline at end of file
@@ -21,14 +21,24 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 
-from dataclasses import dataclass
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
 import re
-from advent.common import INPUTS_FOLDER, TEST_INPUTS_FOLDER, read_file_to_list_of_lines
+from typing import Iterable, Iterator
+from advent.cache import disk_cache
+from advent.common import INPUTS_FOLDER, TEST_INPUTS_FOLDER, InputSource, read_bytes, read_file_to_list_of_lines, tokenize_numbers
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "5.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
 TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, INPUT_FILE_NAME)
 
+MAP_HEADER_PATTERN = re.compile(rb"(\w+)-to-(\w+)")
+# bound of the values going through the maps, used as the ends of the
+# unmapped range which mapper compositions start from
+VALUE_BOUND = 1 << 62
+
 
 @dataclass(slots=True)
 class FunctionRange:
@@ -67,15 +77,72 @@ class FunctionRange:
 
 @dataclass(slots=True)
 class Mapper:
+    """
+    Map described by its mapping ranges. To look values up without going
+    through every mapping range, the starts, ends and offsets of the mapping
+    ranges are also kept in parallel arrays, sorted by range start, which
+    get binary searched.
+    """
     input: str
     output: str
     mapping_ranges: list[FunctionRange]
+    starts: array = field(init=False, repr=False, compare=False)
+    ends: array = field(init=False, repr=False, compare=False)
+    offsets: array = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        sorted_ranges = sorted(self.mapping_ranges, key=lambda x: x.range_start)
+        self.starts = array("q", (range.range_start for range in sorted_ranges))
+        self.ends = array("q", (range.range_end for range in sorted_ranges))
+        self.offsets = array("q", (range.offset for range in sorted_ranges))
 
     def map(self, source_value: int) -> int:
-        for range in self.mapping_ranges:
-            if range.range_start <= source_value <= range.range_end:
-                return source_value + range.offset
+        index = bisect_right(self.starts, source_value) - 1
+        if index >= 0 and source_value <= self.ends[index]:
+            return source_value + self.offsets[index]
         return source_value
+
+    def map_many(self, source_values: Iterable[int]) -> list[int]:
+        """
+        Map every one of the given values, same as map, with the lookups
+        done in a single loop
+        """
+        starts, ends, offsets = self.starts, self.ends, self.offsets
+        mapped_values = []
+        append = mapped_values.append
+        for value in source_values:
+            index = bisect_right(starts, value) - 1
+            if index >= 0 and value <= ends[index]:
+                value += offsets[index]
+            append(value)
+        return mapped_values
+
+    def split_range(self, range_start: int, range_end: int) -> Iterator[FunctionRange]:
+        """
+        Split the given input range into the pieces which the mapping ranges
+        act on, in order. Every piece comes with the offset applied to it,
+        which is 0 for the pieces in between mapping ranges.
+
+        For example, with the mapping ranges 50-97 (offset 2) and 98-99
+        (offset -48), the range 40-98 is split into 40-49 (offset 0),
+        50-97 (offset 2) and 98-98 (offset -48).
+        """
+        starts, ends, offsets = self.starts, self.ends, self.offsets
+        index = bisect_right(starts, range_start) - 1
+        if index < 0 or ends[index] < range_start:
+            index += 1
+        current_start = range_start
+        while index < len(starts) and starts[index] <= range_end:
+            if current_start < starts[index]:
+                yield FunctionRange(current_start, starts[index] - 1, 0)
+                current_start = starts[index]
+            piece_end = min(range_end, ends[index])
+            if current_start <= piece_end:
+                yield FunctionRange(current_start, piece_end, offsets[index])
+                current_start = piece_end + 1
+            index += 1
+        if current_start <= range_end:
+            yield FunctionRange(current_start, range_end, 0)
     
     def compute_output_ranges(
             self,
@@ -90,54 +157,68 @@ class Mapper:
         g(x) = x - 48 in the range 90-99, then the possible output ranges
         are 57-69 and and 81-94. 
 
-        This is a simple example, because both input ranges are covered by 
-        a single output range, but it can get much more complex.
+        The input ranges are sorted, and swept together with the mapping
+        ranges, which are sorted already: as the input ranges only move
+        forward, so does the first mapping range which can still overlap
+        with them. Output ranges come in the order of the input values they
+        were computed from, and are not merged, see coalesce_ranges.
         """
+        starts, ends, offsets = self.starts, self.ends, self.offsets
+        mapping_count = len(starts)
         output_ranges: list[FunctionRange] = []
-
-        for input_range in input_ranges:
-            input_sub_range_start = input_range.range_start
-
-            for mapping_range in self.mapping_ranges:
-                if (
-                    mapping_range.range_start <= input_sub_range_start <= mapping_range.range_end  # input range start fits into function range
-                    or mapping_range.range_start <= input_range.range_end <= mapping_range.range_end  # input range end fits into function range
-                    or (input_sub_range_start <= mapping_range.range_start and input_range.range_end >= mapping_range.range_end)  # input range covers the function range entirely
-                ):
-                    if input_sub_range_start < mapping_range.range_start:
-                        unmapped_range = FunctionRange(
-                            input_sub_range_start,
-                            mapping_range.range_start,
-                            0
-                        )
-                        output_ranges.append(unmapped_range)
-
-                    overlap_start = max(input_range.range_start, mapping_range.range_start)
-                    overlap_end = min(input_range.range_end, mapping_range.range_end)
-
-                    output_range_start = overlap_start + mapping_range.offset
-                    output_range_end = overlap_end + mapping_range.offset
-                    output_range = FunctionRange(
-                        output_range_start,
-                        output_range_end,
-                        mapping_range.offset
+        first_index = 0
+
+        for input_range in sorted(input_ranges, key=lambda x: x.range_start):
+            input_start = input_range.range_start
+            input_end = input_range.range_end
+            if input_end < input_start:
+                continue
+            # mapping ranges ending before this input range also end before
+            # all the following ones
+            while first_index < mapping_count and ends[first_index] < input_start:
+                first_index += 1
+            # start of the part of the input range not mapped yet
+            unmapped_start = input_start
+            index = first_index
+            while index < mapping_count and starts[index] <= input_end:
+                overlap_start = max(input_start, starts[index])
+                overlap_end = min(input_end, ends[index])
+                if overlap_start <= overlap_end:
+                    if unmapped_start < overlap_start:
+                        output_ranges.append(FunctionRange(unmapped_start, overlap_start - 1, 0))
+                    offset = offsets[index]
+                    output_ranges.append(
+                        FunctionRange(overlap_start + offset, overlap_end + offset, offset)
                     )
-                    output_ranges.append(output_range)
-                    input_sub_range_start = overlap_end + 1
-                    if input_sub_range_start >= input_range.range_end:
-                        break
-
-            if input_sub_range_start < input_range.range_end:
-                unmapped_range = FunctionRange(
-                    input_sub_range_start,
-                    input_range.range_end,
-                    0
-                )
-                output_ranges.append(unmapped_range)
+                    unmapped_start = max(unmapped_start, overlap_end + 1)
+                index += 1
+            if unmapped_start <= input_end:
+                output_ranges.append(FunctionRange(unmapped_start, input_end, 0))
 
         return output_ranges
 
 
+def coalesce_ranges(ranges: list[FunctionRange]) -> list[FunctionRange]:
+    """
+    Merge the given ranges into the smallest sorted list of ranges covering
+    the same values, joining ranges which overlap or follow one another.
+    A merged range keeps the offset of its ranges if they all share it, and
+    gets an offset of 0 otherwise.
+    """
+    coalesced_ranges: list[FunctionRange] = []
+    for range in sorted(ranges, key=lambda x: x.range_start):
+        if range.range_end < range.range_start:
+            continue
+        if coalesced_ranges and range.range_start <= coalesced_ranges[-1].range_end + 1:
+            last = coalesced_ranges[-1]
+            last.range_end = max(last.range_end, range.range_end)
+            if last.offset != range.offset:
+                last.offset = 0
+        else:
+            coalesced_ranges.append(FunctionRange(range.range_start, range.range_end, range.offset))
+    return coalesced_ranges
+
+
 def get_mapper_sequence(mappers_input: list[str]) -> list[Mapper]:
     """
     Given the puzzle text input, create a sequence of Mapper instances
@@ -188,6 +269,64 @@ def apply_mappers(seed: int, mappers: list[Mapper]) -> int:
     return transformed_value
 
 
+def apply_mappers_to_ranges(
+    ranges: list[FunctionRange],
+    mappers: list[Mapper]
+) -> list[FunctionRange]:
+    """
+    Given ranges of seeds, and a list of all mappers, compute the ranges of
+    locations, coalescing the ranges after every mapper so that their number
+    does not keep growing from one mapper to the next.
+    """
+    ranges = coalesce_ranges(ranges)
+    for mapper in mappers:
+        ranges = coalesce_ranges(mapper.compute_output_ranges(ranges))
+    return ranges
+
+
+def apply_mappers_many(seeds: Iterable[int], mappers: list[Mapper]) -> list[int]:
+    """
+    Same as apply_mappers, for many seeds at once, mapping all of them
+    through one mapper before moving on to the next one
+    """
+    values = list(seeds)
+    for mapper in mappers:
+        values = mapper.map_many(values)
+    return values
+
+
+def compose_mappers(mappers: list[Mapper]) -> Mapper:
+    """
+    Merge a sequence of mappers into a single Mapper, which maps the input
+    of the first mapper straight to the output of the last one.
+
+    Starting with a single unmapped range covering every value, the ranges
+    are split up at every mapper, each piece getting the sum of the offsets
+    applied to it along the way. Pieces next to each other with the same
+    offset are joined back together, and the ones which end up unmapped are
+    left out, as values outside of the mapping ranges stay the same anyway.
+    """
+    if not mappers:
+        raise ValueError("At least one mapper is needed to compose mappers")
+    segments = [FunctionRange(-VALUE_BOUND, VALUE_BOUND, 0)]
+    for mapper in mappers:
+        split_segments: list[FunctionRange] = []
+        for segment in segments:
+            offset = segment.offset
+            for piece in mapper.split_range(segment.range_start + offset, segment.range_end + offset):
+                piece_start = piece.range_start - offset
+                piece_end = piece.range_end - offset
+                piece_offset = offset + piece.offset
+                previous = split_segments[-1] if split_segments else None
+                if previous is not None and previous.offset == piece_offset:
+                    previous.range_end = piece_end
+                else:
+                    split_segments.append(FunctionRange(piece_start, piece_end, piece_offset))
+        segments = split_segments
+    mapping_ranges = [segment for segment in segments if segment.offset]
+    return Mapper(mappers[0].input, mappers[-1].output, mapping_ranges)
+
+
 def get_seeds(input_text: list[str]) -> list[int]:
     """
     Given the puzzle input, extract the seed numbers.
@@ -200,14 +339,55 @@ def get_seeds(input_text: list[str]) -> list[int]:
             return [int(number) for number in numbers]
 
 
-def main_part_one(puzzle_input_file_path: str | Path = INPUT_FILE_PATH) -> int:
-    puzzle_input = read_file_to_list_of_lines(puzzle_input_file_path)
-    seeds = get_seeds(puzzle_input)
-    mappers = get_mapper_sequence(puzzle_input)
-    locations = [apply_mappers(seed, mappers) for seed in seeds]
-    print("locations: ", locations)
-    lowest_location = min(locations)
-    print(f"The lowest location is {lowest_location}")
+@disk_cache(version=2)
+def parse_almanac(puzzle_input_file_path: InputSource) -> tuple[list[int], list[Mapper]]:
+    """
+    Parse the puzzle input file into the seed numbers and the sequence
+    of Mapper instances. The numbers of the whole file are tokenized in
+    a single pass, and then split up between the seeds and the maps based
+    on the lines of the map titles.
+    """
+    puzzle_input = read_bytes(puzzle_input_file_path)
+    tokens = tokenize_numbers(puzzle_input)
+    headers = list(MAP_HEADER_PATTERN.finditer(puzzle_input))
+    header_lines = [puzzle_input.count(b"\n", 0, header.start()) for header in headers]
+    # the numbers before the first map are the seeds
+    seeds = tokens.values[tokens.line_range(0, header_lines[0] - 1)].tolist()
+    mappers: list[Mapper] = []
+    header_lines.append(tokens.lines[-1] + 1)
+    for i, header in enumerate(headers):
+        input, output = header[1].decode(), header[2].decode()
+        numbers = tokens.values[tokens.line_range(header_lines[i] + 1, header_lines[i + 1] - 1)]
+        ranges = [
+            FunctionRange.from_puzzle_input(numbers[j], numbers[j + 1], numbers[j + 2])
+            for j in range(0, len(numbers) - 2, 3)
+        ]
+        ranges.sort(key=lambda x: x.range_start)
+        mappers.append(Mapper(input, output, ranges))
+    return seeds, mappers
+
+
+@disk_cache(version=1)
+def parse_composed_almanac(puzzle_input_file_path: InputSource) -> tuple[list[int], Mapper]:
+    """
+    Parse the puzzle input file into the seed numbers and a single Mapper,
+    going from seed straight to location, see compose_mappers
+    """
+    seeds, mappers = parse_almanac(puzzle_input_file_path)
+    return seeds, compose_mappers(mappers)
+
+
+def main_part_one(puzzle_input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_05.part_1.parse") as parse_phase:
+        seeds, seed_to_location = parse_composed_almanac(puzzle_input_file_path)
+        parse_phase.add_items(len(seed_to_location.mapping_ranges))
+    with phase("day_05.part_1.solve") as solve_phase:
+        locations = seed_to_location.map_many(seeds)
+        lowest_location = min(locations)
+        solve_phase.add_items(len(seeds))
+    with phase("day_05.part_1.output"):
+        print("locations: ", locations)
+        print(f"The lowest location is {lowest_location}")
     return lowest_location
 
 
@@ -220,6 +400,14 @@ def get_seed_ranges(puzzle_input: list[str]) -> list[FunctionRange]:
         if line.startswith("seeds:"):
             stringified_numbers = re.findall(r"\b\d+\b", line)
             range_numbers = [int(number) for number in stringified_numbers]
+    return seed_ranges_from_seeds(range_numbers)
+
+
+def seed_ranges_from_seeds(range_numbers: list[int]) -> list[FunctionRange]:
+    """
+    Given the seed numbers, interpreted as pairs of range start and range
+    length, represent the possible seed values as function range instances.
+    """
     seed_ranges: list[FunctionRange] = []
     for i in range(0, len(range_numbers), 2):
         range_start = range_numbers[i]
@@ -233,7 +421,7 @@ def get_seed_ranges(puzzle_input: list[str]) -> list[FunctionRange]:
     return seed_ranges
 
 
-def brute_part_two(puzzle_input_file_path: str | Path = INPUT_FILE_PATH) -> None:
+def brute_part_two(puzzle_input_file_path: InputSource = INPUT_FILE_PATH) -> None:
     """
     Brute force solution for part two
     """
@@ -253,23 +441,24 @@ def brute_part_two(puzzle_input_file_path: str | Path = INPUT_FILE_PATH) -> None
     print("\n")
 
 
-def main_part_two(puzzle_input_file_path: str | Path = INPUT_FILE_PATH) -> int:
+def main_part_two(puzzle_input_file_path: InputSource = INPUT_FILE_PATH) -> int:
     """
     Smart solution for part two
     """
-    puzzle_input = read_file_to_list_of_lines(puzzle_input_file_path)
-    seed_ranges = get_seed_ranges(puzzle_input)
-    seed_ranges.sort(key=lambda x: x.range_start)
-    print(seed_ranges)
-    mappers = get_mapper_sequence(puzzle_input)
-    ranges = seed_ranges
-    for mapper in mappers:
-        ranges = mapper.compute_output_ranges(ranges)
-        print(f"for {mapper.input}-to-{mapper.output}, possible ranges are:")
-        ranges.sort(key=lambda x: x.range_start)
+    with phase("day_05.part_2.parse") as parse_phase:
+        seeds, seed_to_location = parse_composed_almanac(puzzle_input_file_path)
+        parse_phase.add_items(len(seed_to_location.mapping_ranges))
+    with phase("day_05.part_2.solve") as solve_phase:
+        seed_ranges = seed_ranges_from_seeds(seeds)
+        seed_ranges.sort(key=lambda x: x.range_start)
+        ranges = coalesce_ranges(seed_to_location.compute_output_ranges(seed_ranges))
+        solve_phase.add_items(len(ranges))
+        min_value = ranges[0].range_start
+    with phase("day_05.part_2.output"):
+        print(seed_ranges)
+        print(f"for {seed_to_location.input}-to-{seed_to_location.output}, possible ranges are:")
         print(ranges)
-    min_value = ranges[0].range_start
-    print("min value: ", min_value)
+        print("min value: ", min_value)
     return min_value
 
 
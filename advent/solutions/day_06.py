@@ -15,10 +15,13 @@ from typing import Union
 from advent.common import (
     INPUTS_FOLDER,
     TEST_INPUTS_FOLDER,
+    InputSource,
+    read_bytes,
     read_file_to_list_of_lines,
-    extract_numbers,
-    extract_to_single_number
+    extract_to_single_number,
+    tokenize_numbers
 )
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "6.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
@@ -84,29 +87,33 @@ def compute_time_range_length(total_time: int, distance: int) -> int:
     return range_end - range_start + 1
 
 
-def parse_input_part_one(file_input_path: str | Path) -> tuple[list[int], list[int]]:
-    puzzle_input = read_file_to_list_of_lines(file_input_path)
-    times_line = puzzle_input[0]
-    assert times_line.startswith("Time:")
-    distances_line = puzzle_input[1]
-    assert distances_line.startswith("Distance:")
-    times = extract_numbers(times_line)
-    distances = extract_numbers(distances_line)
+def parse_input_part_one(file_input_path: InputSource) -> tuple[list[int], list[int]]:
+    puzzle_input = read_bytes(file_input_path)
+    times_line, distances_line = puzzle_input.split(b"\n", 2)[:2]
+    assert times_line.startswith(b"Time:")
+    assert distances_line.startswith(b"Distance:")
+    tokens = tokenize_numbers(puzzle_input)
+    times = tokens.values[tokens.line_range(0, 0)]
+    distances = tokens.values[tokens.line_range(1, 1)]
     assert len(times) == len(distances)
-    return times, distances
-
-
-def main_part_one(file_input_path: str | Path = INPUT_FILE_PATH) -> int:
-    times, distances = parse_input_part_one(file_input_path)
-    total = 1
-    for i in range(len(times)):
-        combinations = compute_time_range_length(times[i], distances[i])
-        total *= combinations
-    print(f"The total number of ways is {total}")
+    return times.tolist(), distances.tolist()
+
+
+def main_part_one(file_input_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_06.part_1.parse") as parse_phase:
+        times, distances = parse_input_part_one(file_input_path)
+        parse_phase.add_items(len(times))
+    with phase("day_06.part_1.solve"):
+        total = 1
+        for i in range(len(times)):
+            combinations = compute_time_range_length(times[i], distances[i])
+            total *= combinations
+    with phase("day_06.part_1.output"):
+        print(f"The total number of ways is {total}")
     return total
 
 
-def parse_input_part_two(file_input_path: str | Path) -> tuple[int, int]:
+def parse_input_part_two(file_input_path: InputSource) -> tuple[int, int]:
     puzzle_input = read_file_to_list_of_lines(file_input_path)
     times_line = puzzle_input[0]
     assert times_line.startswith("Time:")
@@ -117,10 +124,14 @@ def parse_input_part_two(file_input_path: str | Path) -> tuple[int, int]:
     return time, distance
 
 
-def main_part_two(file_input_path: str | Path = INPUT_FILE_PATH) -> int:
-    time, distance = parse_input_part_two(file_input_path)
-    total = compute_time_range_length(time, distance)
-    print(f"The total number of ways is {total}")
+def main_part_two(file_input_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_06.part_2.parse") as parse_phase:
+        time, distance = parse_input_part_two(file_input_path)
+        parse_phase.add_items(1)
+    with phase("day_06.part_2.solve"):
+        total = compute_time_range_length(time, distance)
+    with phase("day_06.part_2.output"):
+        print(f"The total number of ways is {total}")
     return total
 
 if __name__ == "__main__":
@@ -12,11 +12,14 @@ sys.path.insert(0, str(src_dir))
 from dataclasses import dataclass
 from enum import Enum
 from typing import Union
+from advent.cache import disk_cache
 from advent.common import (
     INPUTS_FOLDER,
     TEST_INPUTS_FOLDER,
+    InputSource,
     read_file_to_list_of_stripped_lines
 )
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "7.txt"
 INPUT_FILE_PATH = Path(INPUTS_FOLDER, INPUT_FILE_NAME)
@@ -172,13 +175,15 @@ class JokerHand(Hand):
             return HandStrength.ONE_PAIR
 
 
-def parse_to_list_of_hands(input_file_path: str | Path) -> list[Hand]:
+@disk_cache(version=1)
+def parse_to_list_of_hands(input_file_path: InputSource) -> list[Hand]:
     card_lines = read_file_to_list_of_stripped_lines(input_file_path)
     hands = map(lambda x: Hand.from_input_line(x), card_lines)
     return list(hands)
 
 
-def parse_to_list_of_joker_hands(input_file_path: str | Path) -> list[JokerHand]:
+@disk_cache(version=1)
+def parse_to_list_of_joker_hands(input_file_path: InputSource) -> list[JokerHand]:
     card_lines = read_file_to_list_of_stripped_lines(input_file_path)
     hands = map(lambda x: JokerHand.from_input_line(x), card_lines)
     return list(hands)
@@ -192,19 +197,29 @@ def compute_total_winnings(sorted_hands: list[Hand]) -> int:
     return total
 
 
-def main_part_one(input_file_path: str | Path = INPUT_FILE_PATH) -> int:
-    hands = parse_to_list_of_hands(input_file_path)
-    hands.sort()
-    total_winnings = compute_total_winnings(hands)
-    print(f"The total winnings are {total_winnings}")
+def main_part_one(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_07.part_1.parse") as parse_phase:
+        hands = parse_to_list_of_hands(input_file_path)
+        parse_phase.add_items(len(hands))
+    with phase("day_07.part_1.solve") as solve_phase:
+        hands.sort()
+        total_winnings = compute_total_winnings(hands)
+        solve_phase.add_items(len(hands))
+    with phase("day_07.part_1.output"):
+        print(f"The total winnings are {total_winnings}")
     return total_winnings
 
 
-def main_part_two(input_file_path: str | Path = INPUT_FILE_PATH) -> int:
-    hands = parse_to_list_of_joker_hands(input_file_path)
-    hands.sort()
-    total_winnings = compute_total_winnings(hands)
-    print(f"The total winnings are {total_winnings}")
+def main_part_two(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_07.part_2.parse") as parse_phase:
+        hands = parse_to_list_of_joker_hands(input_file_path)
+        parse_phase.add_items(len(hands))
+    with phase("day_07.part_2.solve") as solve_phase:
+        hands.sort()
+        total_winnings = compute_total_winnings(hands)
+        solve_phase.add_items(len(hands))
+    with phase("day_07.part_2.output"):
+        print(f"The total winnings are {total_winnings}")
     return total_winnings
 
 
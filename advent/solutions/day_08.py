@@ -12,11 +12,14 @@ sys.path.insert(0, str(src_dir))
 import math
 import itertools
 import re
+from advent.cache import disk_cache
 from advent.common import (
     INPUTS_FOLDER,
     TEST_INPUTS_FOLDER,
+    InputSource,
     read_file_to_list_of_stripped_lines
 )
+from advent.metrics import phase
 
 INPUT_FILE_NAME = "8.txt"
 INPUT_FILE_NAME_PART_TWO = "8_2.txt"
@@ -27,7 +30,7 @@ TEST_INPUT_PART_TWO_FILE_PATH = Path(TEST_INPUTS_FOLDER, INPUT_FILE_NAME_PART_TW
 MapDictType = dict[str, tuple[str, str]]
 
 
-def parse_input_part_one(input_file_path: str | Path = INPUT_FILE_PATH) -> tuple[str, MapDictType]:
+def parse_input_part_one(input_file_path: InputSource = INPUT_FILE_PATH) -> tuple[str, MapDictType]:
     """
     Parse the puzzle input into a string containing the LR directions,
     and a dict representing the node map.
@@ -48,26 +51,33 @@ def parse_input_part_one(input_file_path: str | Path = INPUT_FILE_PATH) -> tuple
     return directions, map
 
 
-def find_destination_part_one(input_file_path: str | Path = INPUT_FILE_PATH) -> int:
-    directions, map = parse_input_part_one(input_file_path)
-    coordinate = "AAA"
-    infinite_iterator = itertools.cycle(directions)
-    count = 0
-    for direction in infinite_iterator:
-        next_coordinates = map[coordinate]
-        if direction == "L":
-            coordinate = next_coordinates[0]
-        elif direction == "R":
-            coordinate = next_coordinates[1]
-        else:
-            raise ValueError()
-        count += 1
-        if coordinate == "ZZZ":
-            print(f"It took {count} steps to reach ZZZ")
-            return count
+def find_destination_part_one(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_08.part_1.parse") as parse_phase:
+        directions, map = parse_input_part_one(input_file_path)
+        parse_phase.add_items(len(map))
+    with phase("day_08.part_1.solve") as solve_phase:
+        coordinate = "AAA"
+        infinite_iterator = itertools.cycle(directions)
+        count = 0
+        for direction in infinite_iterator:
+            next_coordinates = map[coordinate]
+            if direction == "L":
+                coordinate = next_coordinates[0]
+            elif direction == "R":
+                coordinate = next_coordinates[1]
+            else:
+                raise ValueError()
+            count += 1
+            if coordinate == "ZZZ":
+                break
+        solve_phase.add_items(count)
+    with phase("day_08.part_1.output"):
+        print(f"It took {count} steps to reach ZZZ")
+    return count
 
 
-def parse_input_part_two(input_file_path: str | Path = INPUT_FILE_PATH) -> tuple[str, list[str], MapDictType]:
+@disk_cache(version=1)
+def parse_input_part_two(input_file_path: InputSource = INPUT_FILE_PATH) -> tuple[str, list[str], MapDictType]:
     input_lines = read_file_to_list_of_stripped_lines(input_file_path)
     directions = input_lines[0]
     map = {}
@@ -82,7 +92,7 @@ def parse_input_part_two(input_file_path: str | Path = INPUT_FILE_PATH) -> tuple
     return directions, starting_coordinates, map
 
 
-def find_destination_part_two_dumb(input_file_path: str | Path = INPUT_FILE_PATH) -> int:
+def find_destination_part_two_dumb(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
     directions, starting_coordinates, map = parse_input_part_two(input_file_path)
     infinite_iterator = itertools.cycle(directions)
     current_coordinates = starting_coordinates
@@ -109,36 +119,41 @@ def find_destination_part_two_dumb(input_file_path: str | Path = INPUT_FILE_PATH
         current_coordinates = next_coordinates
 
 
-def find_destination_part_two_smart(input_file_path: str | Path = INPUT_FILE_PATH) -> int:
-    directions, starting_coordinates, map = parse_input_part_two(input_file_path)
-    infinite_iterator = itertools.cycle(directions)
-    current_coordinates = starting_coordinates
-    print(f"Starting coordinates: {starting_coordinates}")
-    print(f"length: {len(current_coordinates)}")
-    count = 1
-    counts = []
-    for direction in infinite_iterator:
-        if not current_coordinates:
-            break
-        next_coordinates = []
-        for coordinate in current_coordinates:
-            possible_next_coordinates = map[coordinate]
-            if direction == "L":
-                next_coordinate = possible_next_coordinates[0]
-            elif direction == "R":
-                next_coordinate = possible_next_coordinates[1]
-            else:
-                raise ValueError()      
-            if next_coordinate[-1] == "Z":
-                counts.append(count)
-            else:
-                next_coordinates.append(next_coordinate)
-        current_coordinates = next_coordinates
-        count += 1
-    print(f"counts: {counts}")
-    print(f"length: {len(counts)}")
-    answer = math.lcm(*counts)
-    print(f"lowest common multiple: {answer}")
+def find_destination_part_two_smart(input_file_path: InputSource = INPUT_FILE_PATH) -> int:
+    with phase("day_08.part_2.parse") as parse_phase:
+        directions, starting_coordinates, map = parse_input_part_two(input_file_path)
+        parse_phase.add_items(len(map))
+    with phase("day_08.part_2.solve") as solve_phase:
+        infinite_iterator = itertools.cycle(directions)
+        current_coordinates = starting_coordinates
+        count = 1
+        counts = []
+        for direction in infinite_iterator:
+            if not current_coordinates:
+                break
+            next_coordinates = []
+            for coordinate in current_coordinates:
+                possible_next_coordinates = map[coordinate]
+                if direction == "L":
+                    next_coordinate = possible_next_coordinates[0]
+                elif direction == "R":
+                    next_coordinate = possible_next_coordinates[1]
+                else:
+                    raise ValueError()      
+                if next_coordinate[-1] == "Z":
+                    counts.append(count)
+                else:
+                    next_coordinates.append(next_coordinate)
+            current_coordinates = next_coordinates
+            count += 1
+        answer = math.lcm(*counts)
+        solve_phase.add_items(sum(counts))
+    with phase("day_08.part_2.output"):
+        print(f"Starting coordinates: {starting_coordinates}")
+        print(f"length: {len(starting_coordinates)}")
+        print(f"counts: {counts}")
+        print(f"length: {len(counts)}")
+        print(f"lowest common multiple: {answer}")
     return answer
     
 
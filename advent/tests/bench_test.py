@@ -0,0 +1,114 @@
+import sys
+import os
+from pathlib import Path
+
+# add root dir of project to sys path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+script_path = Path(SCRIPT_DIR)
+
+src_dir = script_path.parent.parent.absolute()
+sys.path.insert(0, str(src_dir))
+
+
+from advent.bench import (
+    BenchResult,
+    Regression,
+    find_regressions,
+    load_results,
+    repeated_input,
+    run_benchmarks,
+    save_results
+)
+
+
+def make_result(size: int, wall_time: float, peak_memory: int) -> BenchResult:
+    return BenchResult(
+        day=1,
+        part=2,
+        size=size,
+        line_count=1000 * size,
+        wall_time=wall_time,
+        time_per_line=wall_time / (1000 * size),
+        peak_memory=peak_memory
+    )
+
+
+def test_run_benchmarks(tmp_path):
+    results = list(run_benchmarks(
+        days=[6, 7],
+        parts=[1],
+        sizes=[1, 2],
+        repeat=1,
+        inputs_folder=tmp_path
+    ))
+    assert [result.key for result in results] == [
+        (6, 1, 1), (6, 1, 2), (7, 1, 1), (7, 1, 2)
+    ]
+    assert results[3].line_count == 2 * results[2].line_count
+    for result in results:
+        assert result.wall_time > 0
+        assert result.peak_memory > 0
+
+
+def test_run_benchmarks_on_repeated_input(tmp_path):
+    results = list(run_benchmarks(
+        days=[6, 7],
+        parts=[1],
+        sizes=[1, 2],
+        repeat=1,
+        input_factory=repeated_input,
+        inputs_folder=tmp_path
+    ))
+    # day 6 input cannot be repeated, so there is no size 2 run for it
+    assert [result.key for result in results] == [(6, 1, 1), (7, 1, 1), (7, 1, 2)]
+    assert results[2].line_count == 2 * results[1].line_count
+
+
+def test_repeated_input(tmp_path):
+    input_file_path = repeated_input(2, 3, tmp_path)
+    lines = input_file_path.read_text().splitlines()
+    assert len(lines) == 300
+    assert lines[0] == lines[100] == lines[200]
+    assert repeated_input(5, 3, tmp_path) is None
+
+
+def test_save_and_load_results(tmp_path):
+    results = [make_result(1, 0.5, 1024), make_result(10, 5.0, 2048)]
+    file_path = Path(tmp_path, "results.json")
+    save_results(results, file_path)
+    assert load_results(file_path) == results
+
+
+def test_find_regressions():
+    baseline = [make_result(1, 0.5, 1024), make_result(10, 5.0, 2048)]
+    results = [
+        make_result(1, 0.6, 1024),
+        make_result(10, 7.0, 4096),
+        make_result(100, 50.0, 4096),
+    ]
+    assert find_regressions(results, baseline, threshold=0.25) == [
+        Regression(1, 2, 10, "wall_time", 5.0, 7.0),
+        Regression(1, 2, 10, "peak_memory", 2048, 4096),
+    ]
+
+
+def missing_input(day: int, size: int, folder: Path) -> Path:
+    return Path(folder, f"{day}_{size}_missing.txt")
+
+
+def test_run_benchmarks_records_failures(tmp_path):
+    results = list(run_benchmarks(
+        days=[6],
+        parts=[1],
+        sizes=[1],
+        repeat=1,
+        input_factory=missing_input,
+        inputs_folder=tmp_path
+    ))
+    assert [result.key for result in results] == [(6, 1, 1)]
+    assert results[0].failed
+    assert "FileNotFoundError" in results[0].error
+    assert find_regressions(results, []) == [Regression(6, 1, 1, "error", 0, 0)]
+    file_path = Path(tmp_path, "results.json")
+    save_results(results, file_path)
+    assert load_results(file_path) == results
@@ -0,0 +1,108 @@
+import sys
+import os
+from pathlib import Path
+
+# add root dir of project to sys path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+script_path = Path(SCRIPT_DIR)
+
+src_dir = script_path.parent.parent.absolute()
+sys.path.insert(0, str(src_dir))
+
+
+import pytest
+from advent.cache import disk_cache, clear_cache, evict
+from advent.common import TEST_INPUTS_FOLDER
+from advent.solutions.day_07 import parse_to_list_of_hands
+
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "7.txt")
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    folder = Path(tmp_path, "cache")
+    monkeypatch.setenv("ADVENT_CACHE_DIR", str(folder))
+    monkeypatch.delenv("ADVENT_NO_CACHE", raising=False)
+    return folder
+
+
+@pytest.fixture
+def input_file_path(tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_text("1 2 3\n4 5 6\n")
+    return file_path
+
+
+def make_counting_parser(version: int = 1, **kwargs):
+    calls = []
+
+    @disk_cache(version=version, **kwargs)
+    def parse(input_file_path):
+        calls.append(input_file_path)
+        return Path(input_file_path).read_text().split()
+
+    return parse, calls
+
+
+def test_repeated_parse_is_cached(cache_folder, input_file_path):
+    parse, calls = make_counting_parser()
+    assert parse(input_file_path) == ["1", "2", "3", "4", "5", "6"]
+    assert parse(input_file_path) == ["1", "2", "3", "4", "5", "6"]
+    assert len(calls) == 1
+    assert len(list(cache_folder.iterdir())) == 1
+
+
+def test_changed_input_is_parsed_again(cache_folder, input_file_path):
+    parse, calls = make_counting_parser()
+    parse(input_file_path)
+    input_file_path.write_text("7 8\n")
+    assert parse(input_file_path) == ["7", "8"]
+    assert len(calls) == 2
+
+
+def test_bumped_version_is_parsed_again(cache_folder, input_file_path):
+    parse, calls = make_counting_parser(version=1)
+    parse(input_file_path)
+    parse, calls = make_counting_parser(version=2)
+    parse(input_file_path)
+    assert len(calls) == 1
+    # entry of the old version got replaced
+    assert len(list(cache_folder.iterdir())) == 1
+
+
+def test_cache_clear(cache_folder, input_file_path):
+    parse, calls = make_counting_parser()
+    parse(input_file_path)
+    assert parse.cache_clear() == 1
+    parse(input_file_path)
+    assert len(calls) == 2
+    assert clear_cache() == 1
+
+
+def test_disabled_cache(cache_folder, input_file_path, monkeypatch):
+    monkeypatch.setenv("ADVENT_NO_CACHE", "1")
+    parse, calls = make_counting_parser()
+    parse(input_file_path)
+    parse(input_file_path)
+    assert len(calls) == 2
+    assert not cache_folder.exists()
+
+
+def test_evict(tmp_path):
+    for i in range(5):
+        entry = Path(tmp_path, f"entry-v1-{i}.pickle")
+        entry.write_bytes(bytes(100))
+        os.utime(entry, (i, i))
+    evict(tmp_path, 250)
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == [
+        "entry-v1-3.pickle",
+        "entry-v1-4.pickle"
+    ]
+
+
+def test_cached_hands_are_equal(cache_folder):
+    parse_to_list_of_hands.cache_clear()
+    parsed_hands = parse_to_list_of_hands(TEST_INPUT_FILE_PATH)
+    cached_hands = parse_to_list_of_hands(TEST_INPUT_FILE_PATH)
+    assert cached_hands == parsed_hands
+    assert sorted(cached_hands) == sorted(parsed_hands)
@@ -0,0 +1,125 @@
+import sys
+import os
+from pathlib import Path
+
+# add root dir of project to sys path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+script_path = Path(SCRIPT_DIR)
+
+src_dir = script_path.parent.parent.absolute()
+sys.path.insert(0, str(src_dir))
+
+
+import io
+import subprocess
+import pytest
+from advent import metrics
+from advent.cli import main
+from advent.common import TEST_INPUTS_FOLDER
+from advent.runner import load_part, run_part
+
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "6.txt")
+
+
+def test_run_part():
+    assert run_part(6, 1, TEST_INPUT_FILE_PATH) == 288
+    assert run_part(6, 2, TEST_INPUT_FILE_PATH) == 71503
+
+
+def test_run_part_is_quiet(capsys):
+    run_part(6, 1, TEST_INPUT_FILE_PATH)
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("day, part", [(0, 1), (6, 3)])
+def test_load_unknown_part(day, part):
+    with pytest.raises(ValueError):
+        load_part(day, part)
+
+
+def test_run_command(capsys):
+    main([
+        "run",
+        "--day", "6",
+        "--input", str(TEST_INPUT_FILE_PATH),
+    ])
+    assert capsys.readouterr().out.splitlines() == [
+        f"6\t1\t{TEST_INPUT_FILE_PATH}\t288",
+        f"6\t2\t{TEST_INPUT_FILE_PATH}\t71503",
+    ]
+
+
+def test_only_selected_day_is_imported():
+    code = (
+        "import sys\n"
+        "from advent.cli import main\n"
+        f"main(['run', '--day', '6', '--part', '1', '--input', {str(TEST_INPUT_FILE_PATH)!r}])\n"
+        "print(sorted(name for name in sys.modules if name.startswith('advent.solutions.')))\n"
+    )
+    completed_process = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=src_dir,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert completed_process.stdout.splitlines()[-1] == "['advent.solutions.day_06']"
+
+
+def test_run_command_reads_stdin():
+    completed_process = subprocess.run(
+        [sys.executable, "-m", "advent", "run", "--day", "6", "--input", "-"],
+        cwd=src_dir,
+        input=TEST_INPUT_FILE_PATH.read_bytes(),
+        capture_output=True,
+        check=True
+    )
+    assert completed_process.stdout.decode().splitlines() == [
+        "6\t1\t-\t288",
+        "6\t2\t-\t71503",
+    ]
+
+
+@pytest.mark.parametrize("day, expected", [
+    (1, 142), (2, 8), (4, 13), (5, 35), (6, 288), (7, 6440), (8, 6)
+])
+def test_run_part_on_stream(day, expected):
+    input_file_path = Path(TEST_INPUTS_FOLDER, f"{day}.txt")
+    with open(input_file_path, "rb") as file:
+        stream = io.BytesIO(file.read())
+    assert run_part(day, 1, stream) == expected
+
+
+def test_run_command_writes_metrics(tmp_path):
+    metrics_file_path = Path(tmp_path, "metrics.prom")
+    try:
+        main([
+            "run",
+            "--day", "6",
+            "--part", "1",
+            "--input", str(TEST_INPUT_FILE_PATH),
+            "--metrics", str(metrics_file_path),
+            "--metrics-format", "prometheus",
+        ])
+    finally:
+        metrics.disable()
+        metrics.reset()
+    lines = metrics_file_path.read_text().splitlines()
+    assert 'advent_phase_calls_total{phase="day_06.part_1"} 1' in lines
+    assert 'advent_phase_calls_total{phase="day_06.part_1.parse"} 1' in lines
+
+
+def test_follow_command(tmp_path, capsys):
+    input_file_path = Path(tmp_path, "calibration.txt")
+    input_file_path.write_bytes(Path(TEST_INPUTS_FOLDER, "1_2.txt").read_bytes())
+    main(["follow", "--part", "2", "--input", str(input_file_path), "--once"])
+    assert capsys.readouterr().out == f"1\t2\t{input_file_path}\t281\n"
+    assert Path(tmp_path, "calibration.txt.part2.state.json").exists()
+
+
+def test_follow_command_keeps_parts_apart(tmp_path, capsys):
+    input_file_path = Path(tmp_path, "calibration.txt")
+    input_file_path.write_bytes(Path(TEST_INPUTS_FOLDER, "1_2.txt").read_bytes())
+    main(["follow", "--part", "1", "--input", str(input_file_path), "--once"])
+    main(["follow", "--part", "2", "--input", str(input_file_path), "--once"])
+    assert capsys.readouterr().out.splitlines()[-1] == f"1\t2\t{input_file_path}\t281"
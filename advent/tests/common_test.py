@@ -0,0 +1,222 @@
+import sys
+import os
+from pathlib import Path
+
+# add root dir of project to sys path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+script_path = Path(SCRIPT_DIR)
+
+src_dir = script_path.parent.parent.absolute()
+sys.path.insert(0, str(src_dir))
+
+
+import io
+import pytest
+from advent.common import (
+    TEST_INPUTS_FOLDER,
+    map_bytes,
+    yield_lines,
+    yield_lines_mmap,
+    split_into_line_ranges,
+    map_reduce_lines,
+    map_reduce_ranges,
+    extract_numbers,
+    extract_to_single_number,
+    tokenize_numbers,
+    tokenize_file,
+    write_text_atomically,
+    Grid
+)
+
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "4.txt")
+
+
+def test_yield_lines_mmap_matches_yield_lines():
+    lines = list(yield_lines(TEST_INPUT_FILE_PATH))
+    mmap_lines = [bytes(line) for line in yield_lines_mmap(TEST_INPUT_FILE_PATH)]
+    assert mmap_lines == [line.encode() for line in lines]
+
+
+def test_yield_lines_mmap_as_text():
+    lines = list(yield_lines(TEST_INPUT_FILE_PATH))
+    assert list(yield_lines_mmap(TEST_INPUT_FILE_PATH, as_text=True)) == lines
+
+
+@pytest.mark.parametrize(
+    "contents, lines",
+    [
+        (b"", []),
+        (b"\n", [b"\n"]),
+        (b"abc", [b"abc"]),
+        (b"abc\n\ndef\n", [b"abc\n", b"\n", b"def\n"]),
+    ]
+)
+def test_yield_lines_mmap_edge_cases(tmp_path, contents, lines):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(contents)
+    assert [bytes(line) for line in yield_lines_mmap(file_path)] == lines
+
+
+def test_yield_lines_mmap_range():
+    lines = list(yield_lines(TEST_INPUT_FILE_PATH))
+    range_start = len(lines[0])
+    range_end = range_start + len(lines[1]) + len(lines[2])
+    assert list(
+        yield_lines_mmap(TEST_INPUT_FILE_PATH, True, range_start, range_end)
+    ) == lines[1:3]
+
+
+@pytest.mark.parametrize("range_count", [1, 2, 3, 6, 50])
+def test_split_into_line_ranges(range_count):
+    line_ranges = split_into_line_ranges(TEST_INPUT_FILE_PATH, range_count)
+    assert 0 < len(line_ranges) <= range_count
+    assert line_ranges[0][0] == 0
+    assert line_ranges[-1][1] == os.path.getsize(TEST_INPUT_FILE_PATH)
+    lines = []
+    for i, (range_start, range_end) in enumerate(line_ranges):
+        if i > 0:
+            assert range_start == line_ranges[i - 1][1]
+        lines.extend(
+            yield_lines_mmap(TEST_INPUT_FILE_PATH, True, range_start, range_end)
+        )
+    assert lines == list(yield_lines(TEST_INPUT_FILE_PATH))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_map_reduce_lines(workers):
+    run = map_reduce_lines(TEST_INPUT_FILE_PATH, len, workers=workers)
+    assert run.result == os.path.getsize(TEST_INPUT_FILE_PATH)
+    assert run.line_count == 6
+
+
+def test_map_reduce_lines_keeps_file_order():
+    run = map_reduce_lines(
+        TEST_INPUT_FILE_PATH,
+        lambda line: [line[:6]],
+        initial=[],
+        workers=1
+    )
+    assert run.result == [f"Card {i}" for i in range(1, 7)]
+
+
+def count_range_bytes(file_path, range_start, range_end):
+    if range_end is None:
+        range_end = os.path.getsize(file_path)
+    return range_end - range_start, 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_map_reduce_ranges(workers):
+    run = map_reduce_ranges(TEST_INPUT_FILE_PATH, count_range_bytes, workers=workers)
+    assert run.result == os.path.getsize(TEST_INPUT_FILE_PATH)
+    assert run.line_count == (1 if workers == 1 else len(split_into_line_ranges(TEST_INPUT_FILE_PATH, 8)))
+
+
+def test_tokenize_numbers():
+    tokens = tokenize_numbers(b"Time:  7 15\n\nDistance: -9 40 200\nfoo\n12")
+    assert tokens.values.tolist() == [7, 15, -9, 40, 200, 12]
+    assert tokens.lines.tolist() == [0, 0, 2, 2, 2, 4]
+    assert tokens.columns.tolist() == [7, 9, 10, 13, 16, 0]
+    assert tokens.values[tokens.line_range(1, 2)].tolist() == [-9, 40, 200]
+    assert tokens.values[tokens.line_range(3, 3)].tolist() == []
+    assert [
+        (line, values.tolist()) for line, values in tokens.split_by_line()
+    ] == [(0, [7, 15]), (2, [-9, 40, 200]), (4, [12])]
+
+
+def test_tokenize_file_matches_extract_numbers():
+    tokens = tokenize_file(TEST_INPUT_FILE_PATH)
+    numbers = []
+    for line in yield_lines(TEST_INPUT_FILE_PATH):
+        numbers.extend(extract_numbers(line))
+    assert tokens.values.tolist() == numbers
+
+
+def test_tokenize_empty_file(tmp_path):
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(b"")
+    assert len(tokenize_file(file_path).values) == 0
+
+
+def test_map_bytes(tmp_path):
+    with map_bytes(TEST_INPUT_FILE_PATH) as buffer:
+        assert buffer[:] == TEST_INPUT_FILE_PATH.read_bytes()
+    file_path = Path(tmp_path, "input.txt")
+    file_path.write_bytes(b"")
+    with map_bytes(file_path) as buffer:
+        assert buffer == b""
+    with map_bytes(io.BytesIO(b"1 2\n")) as buffer:
+        assert buffer == b"1 2\n"
+
+
+def test_extract_to_single_number():
+    assert extract_to_single_number("Time:      7  15   30\n") == 71530
+    with pytest.raises(ValueError):
+        extract_to_single_number("Time:\n")
+
+
+def test_grid():
+    grid = Grid(["467..", "..*", "35..#"])
+    assert (grid.height, grid.width) == (3, 5)
+    assert grid[0, 0] == "4"
+    assert grid[1, 2] == "*"
+    # short rows are padded
+    assert grid[1, 4] == "."
+    assert grid.row(2) == b"35..#"
+    index = grid.index(1, 2)
+    assert grid.position(index) == (1, 2)
+    assert sorted(grid.position(i) for i in grid.neighbours(index)) == [
+        (0, 1), (0, 2), (0, 3), (1, 1), (1, 3), (2, 1), (2, 2), (2, 3)
+    ]
+    # neighbours of corner cells are padding
+    assert [grid.cells[i] for i in grid.neighbours(grid.index(0, 0))].count(ord(".")) == 7
+    assert grid.find_all("*") == [index]
+
+
+def test_grid_masks():
+    grid = Grid(["4.*", "#5."])
+    digits = grid.digit_mask()
+    symbols = grid.symbol_mask()
+    assert len(digits) == len(symbols) == len(grid.cells) == 5 * 4
+    assert [digits[grid.index(*position)] for position in ((0, 0), (0, 1), (1, 1))] == [1, 0, 1]
+    assert [grid.position(i) for i, cell in enumerate(symbols) if cell] == [(0, 2), (1, 0)]
+
+
+def test_grid_dilate():
+    grid = Grid(["....", ".*..", "...#"])
+    near_symbol = grid.dilate(grid.symbol_mask())
+    assert len(near_symbol) == len(grid.cells)
+    assert [
+        "".join(str(near_symbol[grid.index(row, column)]) for column in range(grid.width))
+        for row in range(grid.height)
+    ] == ["1110", "1111", "1111"]
+
+
+def test_grid_from_file():
+    grid = Grid.from_file(TEST_INPUT_FILE_PATH)
+    lines = [line.rstrip("\n") for line in yield_lines(TEST_INPUT_FILE_PATH)]
+    assert grid.height == len(lines)
+    assert [grid.row(row).decode() for row in range(grid.height)] == lines
+
+
+@pytest.fixture
+def umask_022():
+    previous_umask = os.umask(0o022)
+    yield
+    os.umask(previous_umask)
+
+
+def test_write_text_atomically_uses_umask_for_new_files(tmp_path, umask_022):
+    file_path = Path(tmp_path, "new.txt")
+    write_text_atomically(file_path, "text")
+    assert file_path.read_text() == "text"
+    assert file_path.stat().st_mode & 0o777 == 0o644
+
+
+def test_write_text_atomically_keeps_permissions(tmp_path, umask_022):
+    file_path = Path(tmp_path, "existing.txt")
+    file_path.write_text("old")
+    file_path.chmod(0o664)
+    write_text_atomically(file_path, "new")
+    assert file_path.read_text() == "new"
+    assert file_path.stat().st_mode & 0o777 == 0o664
@@ -0,0 +1,12 @@
+import pytest
+from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_folder(tmp_path, monkeypatch):
+    """
+    Keep every test away from the cache of parsed inputs in the home folder,
+    so that tests always run the parsers under test rather than reading
+    results pickled by older versions of them.
+    """
+    monkeypatch.setenv("ADVENT_CACHE_DIR", str(Path(tmp_path, "cache")))
@@ -9,9 +9,25 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 # from advent.solutions.day01 import extract__number
-from advent.solutions.day_01 import extract_number, extract_number_spelled
+from advent.solutions.day_01 import (
+    extract_number,
+    extract_number_spelled,
+    follow,
+    update_total,
+    FollowState,
+    sum_spelled_calibration_values,
+    WordMatcher,
+    main_part_one,
+    main_part_one_vectorized,
+    main_part_two,
+    sum_calibration_values
+)
+from advent.common import TEST_INPUTS_FOLDER
 import pytest
 
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "1.txt")
+TEST_INPUT_PART_TWO_FILE_PATH = Path(TEST_INPUTS_FOLDER, "1_2.txt")
+
 
 
 @pytest.mark.parametrize(
@@ -40,4 +56,109 @@ def test_extract_number(input_string, extracted_number):
     ]
 )
 def test_extract_number_spelled(input_string, extracted_number):
-    assert extract_number_spelled(input_string) == extracted_number
\ No newline at end of file
+    assert extract_number_spelled(input_string) == extracted_number
+
+
+@pytest.mark.parametrize(
+    "input_string, first, last",
+    [
+        ("eightwo", 8, 2),
+        ("oneight", 1, 8),
+        ("twone", 2, 1),
+        ("sevenine", 7, 9),
+        ("5", 5, 5),
+        ("abc", None, None),
+    ]
+)
+def test_word_matcher(input_string, first, last):
+    matcher = WordMatcher({"one": 1, "two": 2, "five": 5, "5": 5, "seven": 7, "eight": 8, "nine": 9})
+    assert matcher.first(input_string) == first
+    assert matcher.last(input_string) == last
+
+
+def test_word_matcher_custom_vocabulary():
+    matcher = WordMatcher({"un": 1, "deux": 2, "trois": 3, "x": 10, "deuxieme": 20})
+    # the longest of the words starting first wins
+    assert matcher.first("adeuxiemeun") == 20
+    assert matcher.last("adeuxiemeun") == 1
+    assert matcher.first("troisx") == 3
+    assert matcher.last("troisx") == 10
+    assert extract_number_spelled("undeux", matcher) == 12
+
+
+def test_extract_number_spelled_without_digit():
+    with pytest.raises(ValueError):
+        extract_number_spelled("abc")
+
+
+def test_main_part_one():
+    assert main_part_one(TEST_INPUT_FILE_PATH) == 142
+
+
+def test_main_part_one_vectorized():
+    assert main_part_one_vectorized(TEST_INPUT_FILE_PATH) == 142
+
+
+@pytest.mark.parametrize(
+    "buffer, total",
+    [
+        (b"1abc2\npqr3stu8vwx\na1b2c3d4e5f\ntreb7uchet", 142),
+        (b"1abc2\r\npqr3stu8vwx\r\n", 50),
+        (b"abc\n\n90x\n", 90),
+        (b"12x34\nno digits\n5", 14 + 55),
+        (b"", 0),
+    ]
+)
+def test_sum_calibration_values(buffer, total):
+    assert sum_calibration_values(buffer) == total
+
+
+def test_main_part_two():
+    assert main_part_two(TEST_INPUT_PART_TWO_FILE_PATH) == 281
+
+
+def test_update_total_skips_partial_line(tmp_path):
+    file_path = Path(tmp_path, "calibration.txt")
+    file_path.write_bytes(b"1abc2\npqr3stu")
+    state = update_total(file_path, FollowState())
+    assert (state.offset, state.total) == (6, 12)
+    with open(file_path, "ab") as file:
+        file.write(b"8vwx\ntreb7uchet\n")
+    state = update_total(file_path, state)
+    assert (state.offset, state.total) == (file_path.stat().st_size, 127)
+
+
+def test_update_total_restarts_after_truncation(tmp_path):
+    file_path = Path(tmp_path, "calibration.txt")
+    file_path.write_bytes(b"1abc2\npqr3stu8vwx\n")
+    state = update_total(file_path, FollowState())
+    file_path.write_bytes(b"treb7uchet\n")
+    state = update_total(file_path, state)
+    assert (state.offset, state.total) == (11, 77)
+
+
+def test_follow_resumes_from_saved_state(tmp_path):
+    file_path = Path(tmp_path, "calibration.txt")
+    state_file_path = Path(tmp_path, "state.json")
+    file_path.write_bytes(b"two1nine\neightwothree\n")
+    updates = follow(file_path, state_file_path, sum_spelled_calibration_values, interval=0)
+    assert next(updates).total == 112
+    with open(file_path, "ab") as file:
+        file.write(b"abcone2threexyz\n")
+    assert next(updates).total == 125
+    updates.close()
+    saved_state = FollowState.load(state_file_path)
+    assert saved_state.total == 125
+    # lines summed before are not read again
+    with open(file_path, "r+b") as file:
+        file.write(b"8")
+    assert next(follow(file_path, state_file_path, sum_spelled_calibration_values, interval=0)) == saved_state
+
+
+def test_update_total_restarts_with_another_sum_function(tmp_path):
+    file_path = Path(tmp_path, "calibration.txt")
+    file_path.write_bytes(b"two1nine\neightwothree\n")
+    state = update_total(file_path, FollowState())
+    assert state.total == 11
+    state = update_total(file_path, state, sum_spelled_calibration_values)
+    assert state.total == 112
@@ -9,9 +9,13 @@ src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
 # from advent.solutions.day01 import extract__number
-from advent.solutions.day_02 import find_color_end, ExtractColorResult, HandResult, is_hand_possible, is_game_possible, cube_power_set, find_number_beginning
+from advent.solutions.day_02 import find_color_end, ExtractColorResult, HandResult, is_hand_possible, is_game_possible, cube_power_set, find_number_beginning, main_part_one, main_part_two, GameTable, FeasibilityIndex, parse_game_table, sum_possible_game_ids_many
+from advent.common import TEST_INPUTS_FOLDER
+import random
 import pytest
 
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "2.txt")
+
 
 @pytest.mark.parametrize(
     "input_string, end_index, start_index",
@@ -85,3 +89,91 @@ def test_is_game_possible(game_input, red_max, green_max, blue_max, result):
 )
 def test_cube_power_set(game_input, result):
     assert cube_power_set(game_input) == result
+
+
+def test_main_part_one():
+    assert main_part_one(TEST_INPUT_FILE_PATH) == 8
+
+
+def test_main_part_two():
+    assert main_part_two(TEST_INPUT_FILE_PATH) == 2286
+
+
+def test_game_table():
+    table = GameTable.from_buffer(
+        b"Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n"
+        b"Game 7: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red\n"
+        b"Game 12: 2 red"
+    )
+    assert len(table) == 3
+    assert table.game_ids.tolist() == [1, 7, 12]
+    assert table.colors == ["blue", "red", "green"]
+    assert table.column("red").tolist() == [4, 20, 2]
+    assert table.column("green").tolist() == [2, 13, 0]
+    assert table.column("blue").tolist() == [6, 6, 0]
+    assert table.column("purple").tolist() == [0, 0, 0]
+    assert table.sum_possible_game_ids({"red": 12, "green": 13, "blue": 14}) == 13
+    assert table.sum_power_sets() == 48 + 1560
+
+
+def test_sum_power_sets_of_games_missing_colors():
+    games = b"Game 1: 3 red, 2 green\nGame 2: 1 red, 4 green\n"
+    lines = games.decode().splitlines()
+    assert GameTable.from_buffer(games).sum_power_sets() == 0
+    assert sum(cube_power_set(line) for line in lines) == 0
+    assert GameTable.from_buffer(games + b"Game 3: 1 blue\n").sum_power_sets() == 0
+    assert GameTable.from_buffer(games).sum_power_sets(["red", "green"]) == 6 + 4
+
+
+def test_parse_game_table_matches_line_parsers():
+    table = parse_game_table(TEST_INPUT_FILE_PATH)
+    lines = TEST_INPUT_FILE_PATH.read_text().splitlines()
+    assert table.sum_possible_game_ids({"red": 12, "green": 13, "blue": 14}) == sum(
+        is_game_possible(line, 12, 13, 14) for line in lines
+    )
+    assert table.sum_power_sets() == sum(cube_power_set(line) for line in lines)
+
+
+def test_feasibility_index_matches_game_table():
+    rng = random.Random(3)
+    table = GameTable.from_buffer(b"".join(
+        f"Game {game_id}: {rng.randint(1, 20)} red, {rng.randint(1, 20)} green; "
+        f"{rng.randint(1, 20)} blue\n".encode()
+        for game_id in range(1, 201)
+    ))
+    index = table.feasibility_index()
+    limits_batch = [
+        (rng.randint(0, 22), rng.randint(0, 22), rng.randint(0, 22))
+        for _ in range(100)
+    ] + [(0, 0, 0), (100, 100, 100)]
+    assert index.query_many(limits_batch) == [
+        table.sum_possible_game_ids(dict(zip(("red", "green", "blue"), limits)))
+        for limits in limits_batch
+    ]
+
+
+def test_feasibility_index_of_any_dimension():
+    index = FeasibilityIndex([1, 2, 3], [[5, 1, 3]])
+    assert index.query_many([[0], [1], [4], [5]]) == [0, 2, 5, 6]
+    assert FeasibilityIndex([], [[], []]).query([10, 10]) == 0
+
+
+def test_sum_possible_game_ids_many():
+    assert sum_possible_game_ids_many(TEST_INPUT_FILE_PATH, [(12, 13, 14), (20, 20, 20)]) == [8, 15]
+
+
+def test_game_table_with_many_colors():
+    table = GameTable.from_buffer(
+        b"Game 1: 2 cyan, 1 red; 3 magenta\n"
+        b"Game 2: 5 yellow; 2 cyan, 4 magenta, 1 red\n"
+        b"Game 3: 1 yellow, 1 cyan, 1 magenta, 1 red\n"
+    )
+    assert table.colors == ["cyan", "red", "magenta", "yellow"]
+    assert table.maxima.tolist() == [2, 2, 1, 1, 1, 1, 3, 4, 1, 0, 5, 1]
+    # colors without a limit can have any number of cubes
+    assert table.sum_possible_game_ids({"magenta": 3}) == 4
+    assert table.sum_possible_game_ids({"magenta": 3, "yellow": 0}) == 1
+    assert table.sum_power_sets(table.colors) == 0 + 40 + 1
+    assert table.sum_power_sets(["red", "cyan"]) == 2 + 2 + 1
+    index = table.feasibility_index(["yellow", "magenta"])
+    assert index.query_many([(0, 3), (5, 3), (5, 4)]) == [1, 4, 6]
@@ -8,14 +8,27 @@ script_path = Path(SCRIPT_DIR)
 src_dir = script_path.parent.parent.absolute()
 sys.path.insert(0, str(src_dir))
 
+import io
 import pytest
 from advent.solutions.day_03 import (
     sum_engine_part_numbers,
     get_surrounding_indices,
     is_symbol_adjacent,
     get_surrounding_numbers,
-    sum_gear_ratios
+    sum_gear_ratios,
+    sum_part_numbers,
+    main_part_one,
+    main_part_two,
+    SchematicIndex,
+    stream_part_number_sums,
+    stream_gear_ratio_sums,
+    sum_schematic_tiled,
+    sum_tile,
+    TileSums
 )
+from advent.common import Grid, TEST_INPUTS_FOLDER, split_into_line_ranges
+
+TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, "3.txt")
 
 # test results for generate indices
 # 467 from test str
@@ -161,4 +174,111 @@ def test_get_surrounding_numbers(row_index, character_index, schematic, answer):
 
 
 def test_sum_gear_ratios():
-    assert sum_gear_ratios(test_input) == 467835
\ No newline at end of file
+    assert sum_gear_ratios(test_input) == 467835
+
+def test_sum_part_numbers():
+    assert sum_part_numbers(Grid(test_input)) == 4361
+    # numbers touching the edges of the grid, or symbols only diagonally
+    assert sum_part_numbers(Grid(["12..", "...#", "7..."])) == 0
+    assert sum_part_numbers(Grid(["1.3", ".#.", "7.9"])) == 20
+
+
+def test_main_part_one():
+    assert main_part_one(TEST_INPUT_FILE_PATH) == 4361
+
+
+def test_schematic_index():
+    schematic_index = SchematicIndex(Grid(test_input))
+    assert schematic_index.values[1:3].tolist() == [467, 114]
+    grid = schematic_index.grid
+    assert [schematic_index.labels[grid.index(0, column)] for column in range(6)] == [1, 1, 1, 0, 0, 2]
+    star = grid.index(1, 3)
+    assert schematic_index.adjacent_numbers(star) == [1, 3]
+    assert [grid.position(index) for index in schematic_index.symbols("$#")] == [(3, 6), (8, 3)]
+    assert [
+        (grid.position(index), number_ids)
+        for index, number_ids in schematic_index.symbols_with_adjacent_numbers(1)
+    ] == [((3, 6), [4]), ((4, 3), [5]), ((5, 5), [7]), ((8, 3), [9])]
+    assert sorted(
+        schematic_index.values[number_id]
+        for number_id in schematic_index.numbers_adjacent_to("*")
+    ) == [35, 467, 598, 617, 755]
+    assert schematic_index.sum_part_numbers() == 4361
+    assert schematic_index.sum_gear_ratios() == 467835
+
+
+def test_schematic_index_counts_numbers_once():
+    # the number above the gear touches it with all of its digits
+    assert SchematicIndex(Grid(["123", ".*.", "..4"])).sum_gear_ratios() == 492
+
+
+def test_main_part_two():
+    assert main_part_two(TEST_INPUT_FILE_PATH) == 467835
+
+
+def test_stream_part_number_sums():
+    assert list(stream_part_number_sums(TEST_INPUT_FILE_PATH)) == [
+        467, 0, 668, 0, 617, 0, 592, 755, 0, 1262
+    ]
+    stream = io.BytesIO("\r\n".join(test_input).encode())
+    assert sum(stream_part_number_sums(stream)) == 4361
+
+
+@pytest.mark.parametrize("schematic", [
+    # trailing blank line, below a row with a symbol
+    b"467..114..\n...*......\n..35..633.\n......#...\n\n",
+    # shorter rows next to rows with symbols near their ends
+    b"467..114..\n...*......\n..35..633.\n......#...\n12\n",
+])
+def test_stream_part_number_sums_with_rows_of_different_lengths(schematic):
+    rows = schematic.decode().splitlines()
+    assert sum(stream_part_number_sums(io.BytesIO(schematic))) == sum_engine_part_numbers(rows)
+
+
+def test_stream_gear_ratio_sums():
+    assert list(stream_gear_ratio_sums(TEST_INPUT_FILE_PATH)) == [
+        0, 16345, 0, 0, 0, 0, 0, 0, 451490, 0
+    ]
+    assert sum(stream_gear_ratio_sums(io.BytesIO(b"1*2"))) == 2
+    assert list(stream_gear_ratio_sums(io.BytesIO(b""))) == []
+
+
+@pytest.mark.parametrize("tile_count", [1, 2, 3, 10])
+def test_sum_tile_counts_boundaries_once(tile_count):
+    tiles = split_into_line_ranges(TEST_INPUT_FILE_PATH, tile_count)
+    tile_results = [sum_tile(TEST_INPUT_FILE_PATH, start, end) for start, end in tiles]
+    assert sum(sums.part_numbers for sums, _ in tile_results) == 4361
+    assert sum(sums.gear_ratios for sums, _ in tile_results) == 467835
+    assert sum(row_count for _, row_count in tile_results) == 10
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sum_schematic_tiled(workers):
+    assert sum_schematic_tiled(TEST_INPUT_FILE_PATH, workers) == TileSums(4361, 467835)
+
+
+def test_sum_schematic_tiled_stream():
+    stream = io.BytesIO(TEST_INPUT_FILE_PATH.read_bytes())
+    assert sum_schematic_tiled(stream) == TileSums(4361, 467835)
+
+
+def test_sum_tile_whole_file():
+    assert sum_tile(TEST_INPUT_FILE_PATH) == (TileSums(4361, 467835), 10)
+
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_sum_schematic_tiled_with_trailing_blank_line(tmp_path, workers):
+    # the blank line ends up as the halo row below the tile holding the #
+    schematic_file_path = tmp_path / "schematic.txt"
+    schematic_file_path.write_bytes(b"467..114..\n...*......\n..35..633.\n......#...\n\n")
+    assert sum_schematic_tiled(schematic_file_path, workers) == TileSums(1135, 16345)
+    for tile_count in (2, 3, 5):
+        tiles = split_into_line_ranges(schematic_file_path, tile_count)
+        tile_results = [sum_tile(schematic_file_path, start, end) for start, end in tiles]
+        assert sum(sums.part_numbers for sums, _ in tile_results) == 1135
+
+
+def test_mains_on_streams():
+    assert main_part_one(io.BytesIO(TEST_INPUT_FILE_PATH.read_bytes())) == 4361
+    assert main_part_two(io.BytesIO(TEST_INPUT_FILE_PATH.read_bytes())) == 467835
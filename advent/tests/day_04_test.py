@@ -18,8 +18,10 @@ TEST_INPUT_FILE_PATH = Path(TEST_INPUTS_FOLDER, TEST_INPUT_FILE_NAME)
 
 from advent.solutions.day_04 import (
     main_part_one,
-    count_points_for_every_card,
-    count_all_cards
+    count_all_cards,
+    count_cards,
+    count_matches,
+    parse_match_counts
 )
 
 
@@ -29,16 +31,54 @@ def test_main_part_one():
     assert main_part_one(TEST_INPUT_FILE_PATH) == 13
 
 
-def test_count_points_for_every_card():
-    result = count_points_for_every_card(TEST_INPUT_FILE_PATH)
-    assert result == {
-        1: 4,
-        2: 2,
-        3: 2,
-        4: 1,
-        5: 0,
-        6: 0
-    }
+def test_main_part_one_parallel():
+    assert main_part_one(TEST_INPUT_FILE_PATH, workers=2) == 13
+
+
+@pytest.mark.parametrize("scratchcard,expected", [
+    ("Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53", 4),
+    ("Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36", 0),
+    ("Card 7: 1 2 | 2 2 1 3", 2),
+    ("Card 8: 120 7 | 7 120 1", 2),
+    ("Card 9: 05 4097 | 5 4096", 1),
+    ("Card 10: 123456789 | 5 123456789", 1),
+    ("Card 11: 1234567890 | 5", 0),
+])
+def test_count_matches(scratchcard, expected):
+    assert count_matches(scratchcard) == expected
+
+
+def test_parse_match_counts():
+    assert list(parse_match_counts(TEST_INPUT_FILE_PATH)) == [4, 2, 2, 1, 0, 0]
+
+
+def test_parse_match_counts_skips_blank_lines(tmp_path):
+    file_path = tmp_path / "cards.txt"
+    file_path.write_text("Card 1: 1 2 | 2 3\n\nCard 2: 4 | 4\r\n  \n")
+    assert list(parse_match_counts(file_path)) == [1, 1]
+
+
+def test_parse_match_counts_from_stream():
+    with open(TEST_INPUT_FILE_PATH, "rb") as stream:
+        assert list(parse_match_counts(stream)) == [4, 2, 2, 1, 0, 0]
+
+
+def test_count_all_cards():
+    assert count_all_cards(TEST_INPUT_FILE_PATH) == 30
+
+
+def test_count_cards_with_exponential_copies():
+    card_count = 200
+    # two matches per card, apart from the last two, which cannot win
+    # cards past the last one
+    scratchcards = [f"Card {card_id}: 1 2 | 1 2" for card_id in range(1, card_count - 1)]
+    scratchcards.append(f"Card {card_count - 1}: 1 2 | 1 3")
+    scratchcards.append(f"Card {card_count}: 1 2 | 3 4")
+    # every card is won by each copy of the two cards before it
+    copies = [1, 2]
+    for _ in range(card_count - 2):
+        copies.append(1 + copies[-1] + copies[-2])
+    assert count_cards(scratchcards) == sum(copies)
 
 
 if __name__ == "__main__":
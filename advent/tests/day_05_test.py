@@ -21,7 +21,14 @@ from advent.solutions.day_05 import (
     Mapper,
     FunctionRange,
     get_mapper_sequence,
-    main_part_two
+    main_part_two,
+    apply_mappers,
+    apply_mappers_many,
+    compose_mappers,
+    coalesce_ranges,
+    apply_mappers_to_ranges,
+    seed_ranges_from_seeds,
+    parse_almanac
 )
 
 
@@ -31,6 +38,62 @@ def test_main_part_one():
 
 
 
+@pytest.mark.parametrize("value,expected", [
+    (0, 0),
+    (49, 49),
+    (50, 52),
+    (97, 99),
+    (98, 50),
+    (99, 51),
+    (100, 100),
+])
+def test_mapper_map(value, expected):
+    mapper = Mapper("seed", "soil", [
+        FunctionRange.from_puzzle_input(50, 98, 2),
+        FunctionRange.from_puzzle_input(52, 50, 48),
+    ])
+    assert mapper.map(value) == expected
+    assert mapper.map_many([value, value]) == [expected, expected]
+
+
+def test_apply_mappers_many():
+    seeds, mappers = parse_almanac(TEST_INPUT_FILE_PATH)
+    assert apply_mappers_many(seeds, mappers) == [apply_mappers(seed, mappers) for seed in seeds]
+    assert apply_mappers_many(seeds, mappers) == [82, 43, 86, 35]
+
+
+def test_split_range():
+    mapper = Mapper("seed", "soil", [
+        FunctionRange.from_puzzle_input(50, 98, 2),
+        FunctionRange.from_puzzle_input(52, 50, 48),
+    ])
+    assert list(mapper.split_range(40, 98)) == [
+        FunctionRange(40, 49, 0),
+        FunctionRange(50, 97, 2),
+        FunctionRange(98, 98, -48),
+    ]
+    assert list(mapper.split_range(60, 70)) == [FunctionRange(60, 70, 2)]
+    assert list(mapper.split_range(99, 120)) == [
+        FunctionRange(99, 99, -48),
+        FunctionRange(100, 120, 0),
+    ]
+
+
+def test_compose_mappers():
+    seeds, mappers = parse_almanac(TEST_INPUT_FILE_PATH)
+    seed_to_location = compose_mappers(mappers)
+    assert seed_to_location.input == "seed"
+    assert seed_to_location.output == "location"
+    values = list(range(0, 120))
+    assert seed_to_location.map_many(values) == apply_mappers_many(values, mappers)
+    assert seed_to_location.map_many(seeds) == [82, 43, 86, 35]
+
+
+def test_compose_mappers_without_mappers():
+    with pytest.raises(ValueError):
+        compose_mappers([])
+
+
 class TestComputeOutputRanges:
 
     @staticmethod
@@ -138,7 +201,7 @@ class TestComputeOutputRanges:
         first_output_range = output_ranges[0]
         assert first_output_range == FunctionRange(
             range_start=2,
-            range_end=7,
+            range_end=6,
             offset=0
         )
         second_output_range = output_ranges[1]
@@ -181,7 +244,46 @@ class TestComputeOutputRanges:
         assert first_output_range == FunctionRange(53, 56, -4)
         assert second_output_range == FunctionRange(61, 69, 0)
 
+    @staticmethod
+    def test_input_ranges_between_and_around_mapping_ranges():
+        mapper = Mapper("foo", "bar", [FunctionRange(10, 19, 100), FunctionRange(30, 39, -30)])
+        input_ranges = [FunctionRange(35, 50, 0), FunctionRange(0, 12, 0), FunctionRange(20, 25, 0)]
+        assert mapper.compute_output_ranges(input_ranges) == [
+            FunctionRange(0, 9, 0),
+            FunctionRange(110, 112, 100),
+            FunctionRange(20, 25, 0),
+            FunctionRange(5, 9, -30),
+            FunctionRange(40, 50, 0),
+        ]
+
+
+def test_coalesce_ranges():
+    ranges = [
+        FunctionRange(20, 25, 3),
+        FunctionRange(0, 9, 3),
+        FunctionRange(10, 12, 3),
+        FunctionRange(24, 30, 5),
+        FunctionRange(40, 39, 0),
+        FunctionRange(32, 35, 1),
+    ]
+    assert coalesce_ranges(ranges) == [
+        FunctionRange(0, 12, 3),
+        FunctionRange(20, 30, 0),
+        FunctionRange(32, 35, 1),
+    ]
+
 
+def test_apply_mappers_to_ranges():
+    seeds, mappers = parse_almanac(TEST_INPUT_FILE_PATH)
+    location_ranges = apply_mappers_to_ranges(seed_ranges_from_seeds(seeds), mappers)
+    assert location_ranges[0].range_start == 46
+    seed_to_location = compose_mappers(mappers)
+    composed_ranges = coalesce_ranges(
+        seed_to_location.compute_output_ranges(seed_ranges_from_seeds(seeds))
+    )
+    assert [(r.range_start, r.range_end) for r in location_ranges] == [
+        (r.range_start, r.range_end) for r in composed_ranges
+    ]
 
 
 def test_get_mapper_sequence():
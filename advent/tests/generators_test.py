@@ -0,0 +1,87 @@
+import sys
+import os
+from pathlib import Path
+
+# add root dir of project to sys path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+script_path = Path(SCRIPT_DIR)
+
+src_dir = script_path.parent.parent.absolute()
+sys.path.insert(0, str(src_dir))
+
+
+import io
+import itertools
+import math
+import pytest
+from advent.bench import DEFAULT_SIZES, GENERATED_BASE_SIZES
+from advent.generators import GENERATORS, MAX_RACES, generate_lines, write_input
+from advent.runner import PARTS, run_part
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_generated_input_is_deterministic(day):
+    assert list(generate_lines(day, 20, seed=7)) == list(generate_lines(day, 20, seed=7))
+    assert list(generate_lines(day, 20, seed=7)) != list(generate_lines(day, 20, seed=8))
+
+
+@pytest.mark.parametrize("day", sorted(GENERATORS))
+def test_generated_input_is_solvable(day, tmp_path):
+    input_file_path = Path(tmp_path, "input.txt")
+    with open(input_file_path, "w") as file:
+        write_input(day, 50, seed=1, output=file)
+    for part in PARTS:
+        assert run_part(day, part, input_file_path) is not None
+
+
+def count_winning_holds(time, distance):
+    """Count the button holds beating the record, with integers only"""
+    hold = (time - math.isqrt(max(time * time - 4 * distance, 0))) // 2
+    while hold * (time - hold) <= distance:
+        hold += 1
+    return max(time - 2 * hold + 1, 0)
+
+
+@pytest.mark.parametrize("size", DEFAULT_SIZES)
+def test_generated_races_are_solved_exactly(size, tmp_path):
+    input_file_path = Path(tmp_path, "input.txt")
+    with open(input_file_path, "w") as file:
+        write_input(6, GENERATED_BASE_SIZES[6] * size, seed=size, output=file)
+    times_line, distances_line = input_file_path.read_text().splitlines()
+    times = [int(time) for time in times_line.split()[1:]]
+    distances = [int(distance) for distance in distances_line.split()[1:]]
+    assert len(times) <= MAX_RACES
+    assert run_part(6, 1, input_file_path) == math.prod(
+        count_winning_holds(time, distance) for time, distance in zip(times, distances)
+    )
+    assert run_part(6, 2, input_file_path) == count_winning_holds(
+        int("".join(map(str, times))), int("".join(map(str, distances)))
+    )
+
+
+def test_generated_input_is_lazy():
+    lines = generate_lines(1, 10 ** 12)
+    assert len(list(itertools.islice(lines, 5))) == 5
+
+
+@pytest.mark.parametrize(
+    "day, size, line_count",
+    [
+        (1, 30, 30),
+        (5, 30, 1 + 7 * (2 + 30)),
+        (6, 30, 2),
+        (8, 30, 2 + 30),
+    ]
+)
+def test_generated_input_size(day, size, line_count):
+    output = io.StringIO()
+    write_input(day, size, output=output)
+    assert len(output.getvalue().splitlines()) == line_count
+
+
+def test_generated_scratchcards_stay_within_cards():
+    lines = list(generate_lines(4, 100))
+    for card_index, line in enumerate(lines):
+        winning, held = line.split(":")[1].split("|")
+        match_count = len(set(winning.split()) & set(held.split()))
+        assert card_index + match_count < len(lines)
@@ -0,0 +1,90 @@
+import sys
+import os
+from pathlib import Path
+
+# add root dir of project to sys path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+script_path = Path(SCRIPT_DIR)
+
+src_dir = script_path.parent.parent.absolute()
+sys.path.insert(0, str(src_dir))
+
+
+import json
+import pytest
+from advent import metrics
+from advent.common import TEST_INPUTS_FOLDER
+from advent.solutions import day_07
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_phase_is_not_recorded_when_disabled():
+    metrics.reset()
+    with metrics.phase("ignored") as current_phase:
+        current_phase.add_items(3)
+    assert metrics.get_metrics() == {}
+
+
+def test_phase(enabled_metrics):
+    for _ in range(2):
+        with metrics.phase("outer") as outer_phase:
+            outer_phase.add_items(2)
+            with metrics.phase("inner"):
+                sum(range(1000))
+    recorded = metrics.get_metrics()
+    assert list(recorded) == ["outer", "inner"]
+    assert recorded["outer"].calls == 2
+    assert recorded["outer"].items == 4
+    assert recorded["inner"].items == 0
+    assert recorded["outer"].wall_time_ns >= recorded["inner"].wall_time_ns > 0
+
+
+def test_phase_is_recorded_on_error(enabled_metrics):
+    with pytest.raises(KeyError):
+        with metrics.phase("failing"):
+            raise KeyError()
+    assert metrics.get_metrics()["failing"].calls == 1
+
+
+def test_timed(enabled_metrics):
+    @metrics.timed("squares", items=len)
+    def squares(count: int) -> list[int]:
+        return [i * i for i in range(count)]
+
+    assert squares(5) == [0, 1, 4, 9, 16]
+    assert squares(3) == [0, 1, 4]
+    recorded = metrics.get_metrics()["squares"]
+    assert recorded.calls == 2
+    assert recorded.items == 8
+
+
+def test_solution_phases(enabled_metrics):
+    day_07.main_part_one(Path(TEST_INPUTS_FOLDER, "7.txt"))
+    recorded = metrics.get_metrics()
+    assert list(recorded) == [
+        "day_07.part_1.parse", "day_07.part_1.solve", "day_07.part_1.output"
+    ]
+    assert recorded["day_07.part_1.parse"].items == 5
+
+
+def test_export(enabled_metrics, tmp_path):
+    with metrics.phase("day_01.part_1.solve") as current_phase:
+        current_phase.add_items(7)
+    json_file_path = Path(tmp_path, "metrics.json")
+    metrics.write_json(json_file_path)
+    exported = json.loads(json_file_path.read_text())
+    assert exported[0]["name"] == "day_01.part_1.solve"
+    assert exported[0]["items"] == 7
+    prometheus_file_path = Path(tmp_path, "metrics.prom")
+    metrics.write_prometheus(prometheus_file_path)
+    lines = prometheus_file_path.read_text().splitlines()
+    assert "# TYPE advent_phase_items_total counter" in lines
+    assert 'advent_phase_items_total{phase="day_01.part_1.solve"} 7' in lines